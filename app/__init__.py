@@ -1 +1,5 @@
+from time import perf_counter
+
 __version__ = "0.3.0"
+
+IMPORT_STARTED_AT = perf_counter()
@@ -6,12 +6,14 @@ from fastapi.security import APIKeyHeader
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN
 
 from app.api.dependencies.database import get_repository
+from app.api.dependencies.settings import get_settings
 from app.core import constant, settings
-from app.core.config import get_app_settings
 from app.core.settings.app import AppSettings
 from app.core.token import get_user_from_token
 from app.database.repositories.users import UsersRepository
 from app.models.user import User
+from app.utils.request_context import timed_phase
+from app.utils.tracing import traced
 
 AUTH_HEADER_KEY = settings.auth_header_key
 
@@ -34,9 +36,9 @@ def _get_auth_header_retriever(
     return _get_auth_from_header if required else _get_auth_from_header_optional
 
 
-def _get_auth_from_header(
+async def _get_auth_from_header(
     api_key: str = Security(RWAPIKeyHeader(name=AUTH_HEADER_KEY)),
-    settings: AppSettings = Depends(get_app_settings),
+    settings: AppSettings = Depends(get_settings),
 ) -> str:
     try:
         token_prefix, token = api_key.split(" ")
@@ -55,20 +57,22 @@ def _get_auth_from_header(
     return token
 
 
-def _get_auth_from_header_optional(
+async def _get_auth_from_header_optional(
     auth: str | None = Security(RWAPIKeyHeader(name=AUTH_HEADER_KEY, auto_error=False)),
-    settings: AppSettings = Depends(get_app_settings),
+    settings: AppSettings = Depends(get_settings),
 ) -> str:
     if auth:
-        return _get_auth_from_header(api_key=auth, settings=settings)
+        return await _get_auth_from_header(api_key=auth, settings=settings)
 
     return ""
 
 
+@traced("dependency.get_current_user")
+@timed_phase("auth")
 async def _get_current_user(
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     token: str = Depends(_get_auth_header_retriever()),
-    settings: AppSettings = Depends(get_app_settings),
+    settings: AppSettings = Depends(get_settings),
 ) -> User:
     try:
         secret_key = str(settings.secret_key.get_secret_value())
@@ -101,7 +105,7 @@ async def _get_current_user(
 async def _get_current_user_optional(
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     token: str = Depends(_get_auth_header_retriever()),
-    settings: AppSettings = Depends(get_app_settings),
+    settings: AppSettings = Depends(get_settings),
 ) -> User | None:
     if token:
         return await _get_current_user(users_repo=users_repo, token=token, settings=settings)
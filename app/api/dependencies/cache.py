@@ -0,0 +1,7 @@
+from fastapi import Request
+
+from app.utils.response_cache import ResponseCache
+
+
+async def get_users_cache(request: Request) -> ResponseCache:
+    return request.app.state.users_cache
@@ -1,16 +1,22 @@
 from collections.abc import AsyncGenerator, Callable
+from functools import cache
 
-from fastapi import Depends
+from fastapi import Depends, FastAPI
 from fastapi.requests import Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from app.database.repositories.base import BaseRepository
+from app.utils.tracing import traced
 
 
-def _get_db_session(request: Request) -> AsyncSession:
+async def _get_db_session(request: Request) -> AsyncSession:
     return request.app.state.pool
 
 
+async def get_db_engine(request: Request) -> AsyncEngine:
+    return request.app.state.engine
+
+
 async def _get_connection_from_session(
     pool: AsyncSession = Depends(_get_db_session),
 ) -> AsyncGenerator[AsyncSession, None]:
@@ -18,12 +24,25 @@ async def _get_connection_from_session(
         yield session
 
 
+@cache
 def get_repository(
     repo_type: type[BaseRepository],
 ) -> Callable[[AsyncSession], BaseRepository]:
-    def _get_repo(
+    # one provider per repository type, so FastAPI caches a single repository per request
+    # instead of building one for every place that depends on it
+    @traced(f"dependency.get_repository.{repo_type.__name__}")
+    async def _get_repo(
         session: AsyncSession = Depends(_get_connection_from_session),
     ) -> BaseRepository:
         return repo_type(session)
 
     return _get_repo
+
+
+def override_repository(app: FastAPI, repo_type: type[BaseRepository], repository: BaseRepository) -> None:
+    """Serve ``repository`` wherever the app depends on ``get_repository(repo_type)``."""
+
+    async def _get_repo() -> BaseRepository:
+        return repository
+
+    app.dependency_overrides[get_repository(repo_type)] = _get_repo
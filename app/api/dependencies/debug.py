@@ -0,0 +1,30 @@
+from secrets import compare_digest
+
+from fastapi import Depends, Header
+from fastapi.exceptions import HTTPException
+from starlette.status import HTTP_403_FORBIDDEN
+
+from app.api.dependencies.settings import get_settings
+from app.core import constant, settings
+from app.core.settings.app import AppSettings
+
+DEBUG_TOKEN_HEADER_KEY = settings.debug_token_header_key
+
+
+def has_debug_access(debug_token: str | None, settings: AppSettings) -> bool:
+    if settings.debug:
+        return True
+
+    expected_token = settings.debug_token.get_secret_value() if settings.debug_token else ""
+    return bool(expected_token and debug_token and compare_digest(debug_token, expected_token))
+
+
+async def verify_debug_access(
+    debug_token: str | None = Header(default=None, alias=DEBUG_TOKEN_HEADER_KEY),
+    settings: AppSettings = Depends(get_settings),
+) -> None:
+    if not has_debug_access(debug_token, settings):
+        raise HTTPException(
+            status_code=HTTP_403_FORBIDDEN,
+            detail=constant.FAIL_AUTH_DEBUG_ACCESS,
+        )
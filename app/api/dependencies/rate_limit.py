@@ -0,0 +1,53 @@
+from fastapi import Depends, Request
+from fastapi.exceptions import HTTPException
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+
+from app.api.dependencies.settings import get_settings
+from app.core import constant
+from app.core.settings.app import AppSettings
+from app.utils.metrics import REQUESTS_RATE_LIMITED
+from app.utils.rate_limit import RateLimit
+from app.utils.request_context import add_response_header
+
+
+async def _get_target_email(request: Request) -> str | None:
+    # the raw body is cached once FastAPI has read it for the route, but it is parsed again here
+    # because signup and signin validate it into different models
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    email = body.get("email") if isinstance(body, dict) else None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+async def limit_auth_attempts(
+    request: Request,
+    settings: AppSettings = Depends(get_settings),
+) -> None:
+    """Rate limit auth attempts per client IP and per target account before any hashing or lookup."""
+    if not settings.rate_limit_enabled:
+        return
+
+    backend = request.app.state.rate_limiter
+    client_ip = request.client.host if request.client else "unknown"
+    checks = [("ip", f"auth:ip:{client_ip}", settings.rate_limit_auth_ip_limit, settings.rate_limit_auth_ip_window_s)]
+    email = await _get_target_email(request)
+    if email is not None:
+        checks.append(("email", f"auth:email:{email}", settings.rate_limit_auth_email_limit, settings.rate_limit_auth_email_window_s))
+
+    tightest: RateLimit | None = None
+    for scope, key, limit, window in checks:
+        rate_limit = await backend.hit(key, limit, window)
+        if not rate_limit.allowed:
+            REQUESTS_RATE_LIMITED.labels(scope).inc()
+            raise HTTPException(
+                status_code=HTTP_429_TOO_MANY_REQUESTS,
+                detail=constant.FAIL_RATE_LIMITED,
+                headers=rate_limit.headers(),
+            )
+        if tightest is None or rate_limit.remaining < tightest.remaining:
+            tightest = rate_limit
+
+    for name, value in tightest.headers().items():
+        add_response_header(name, value)
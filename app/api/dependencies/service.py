@@ -1,10 +1,16 @@
 from collections.abc import Callable
+from functools import cache
 
 from app.services.base import BaseService
 
 
+@cache
 def get_service(service_type: type[BaseService]) -> Callable[[], BaseService]:
-    def _get_service() -> BaseService:
-        return service_type()
+    # services are stateless, so one instance is shared by every request; caching the provider
+    # also lets FastAPI recognise the same dependency across routes
+    service = service_type()
+
+    async def _get_service() -> BaseService:
+        return service
 
     return _get_service
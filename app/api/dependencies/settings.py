@@ -0,0 +1,8 @@
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
+
+
+async def get_settings() -> AppSettings:
+    # get_app_settings is cached, and an async provider keeps the lookup off the threadpool;
+    # override this dependency, not get_app_settings, to swap the settings in a test
+    return get_app_settings()
@@ -1,8 +1,11 @@
 from app.schemas.user import UsersFilters
 
+DEFAULT_USERS_FILTERS = UsersFilters()
 
-def get_users_filters(skip: int | None = 0, limit: int | None = 100) -> UsersFilters:
+
+async def get_users_filters(skip: int | None = 0, limit: int | None = 100) -> UsersFilters:
+    # resolved here, so an omitted filter and its default query and cache the same page
     return UsersFilters(
-        skip=skip,
-        limit=limit,
+        skip=skip if skip is not None else DEFAULT_USERS_FILTERS.skip,
+        limit=limit if limit is not None else DEFAULT_USERS_FILTERS.limit,
     )
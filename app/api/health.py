@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
+from starlette.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
+
+from app.core import constant
+
+router = APIRouter()
+
+LIVE_BODY = b'{"status":"ok"}'
+
+
+@router.get(
+    "/healthz",
+    status_code=HTTP_200_OK,
+    include_in_schema=False,
+    name="health:live",
+)
+async def read_liveness() -> Response:
+    # the process is serving requests, which is all liveness means; nothing else is checked
+    return Response(content=LIVE_BODY, media_type="application/json")
+
+
+@router.get(
+    "/readyz",
+    status_code=HTTP_200_OK,
+    include_in_schema=False,
+    name="health:ready",
+)
+async def read_readiness(request: Request) -> JSONResponse:
+    health = request.app.state.db_health
+    report = health.report(getattr(request.app.state, "engine", None))
+    if report["ready"]:
+        return JSONResponse({"message": constant.SUCCESS_READY, "data": report}, status_code=HTTP_200_OK)
+    return JSONResponse({"message": constant.FAIL_NOT_READY, "data": report}, status_code=HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from starlette.status import HTTP_200_OK
+
+from app.utils.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    status_code=HTTP_200_OK,
+    include_in_schema=False,
+    name="monitoring:metrics",
+)
+def read_metrics() -> Response:
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
@@ -0,0 +1,75 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import Response
+from starlette.datastructures import Headers
+from starlette.status import HTTP_200_OK
+
+from app.core import settings
+from app.utils.static_files import REVALIDATE_CACHE_CONTROL, StaticAsset, asset_response, build_asset
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "openapi.json"
+# ``info`` carries the per-environment title, so only the API surface is checked for drift
+DRIFT_IGNORED_KEYS = frozenset({"info"})
+
+router = APIRouter()
+
+
+def build_openapi_document(app: FastAPI) -> StaticAsset:
+    """Encode the application's OpenAPI schema once, together with its gzip variant and ETag."""
+    body = json.dumps(app.openapi(), ensure_ascii=False, separators=(",", ":")).encode()
+    return build_asset("openapi.json", body, "application/json")
+
+
+def get_openapi_document(app: FastAPI) -> StaticAsset:
+    document = getattr(app.state, "openapi_document", None)
+    if document is None:
+        document = app.state.openapi_document = build_openapi_document(app)
+    return document
+
+
+def schema_drift(committed: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """Return the top-level sections of the schema that differ between ``committed`` and ``current``."""
+    keys = (committed.keys() | current.keys()) - DRIFT_IGNORED_KEYS
+    return sorted(key for key in keys if committed.get(key) != current.get(key))
+
+
+@router.get(
+    settings.openapi_url,
+    status_code=HTTP_200_OK,
+    include_in_schema=False,
+    name="openapi",
+)
+async def read_openapi(request: Request) -> Response:
+    return asset_response(get_openapi_document(request.app), Headers(scope=request.scope), REVALIDATE_CACHE_CONTROL)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.api.openapi", description="Export or check the committed OpenAPI schema.")
+    parser.add_argument("command", choices=["export", "check"])
+    parser.add_argument("path", nargs="?", type=Path, default=SCHEMA_PATH)
+    args = parser.parse_args(argv)
+
+    from app.main import app  # local import, building the app needs the settings of the environment
+
+    current = app.openapi()
+    if args.command == "export":
+        args.path.write_text(json.dumps(current, ensure_ascii=False, indent=2) + "\n")
+        print(f"Wrote OpenAPI schema to {args.path}")
+        return 0
+
+    committed = json.loads(args.path.read_text())
+    drift = schema_drift(committed, current)
+    if drift:
+        print(f"OpenAPI schema in {args.path} is out of date ({', '.join(drift)}); run `make openapi`.", file=sys.stderr)
+        return 1
+    print(f"OpenAPI schema in {args.path} is up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
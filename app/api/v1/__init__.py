@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
-from app.api.v1 import auth, users
+from app.api.v1 import auth, debug, users
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(debug.router, prefix="/debug", tags=["debug"], include_in_schema=False)
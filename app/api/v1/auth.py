@@ -2,15 +2,18 @@ from fastapi import APIRouter, Depends
 from starlette.status import HTTP_200_OK, HTTP_201_CREATED
 
 from app.api.dependencies.auth import get_current_user_auth
+from app.api.dependencies.cache import get_users_cache
 from app.api.dependencies.database import get_repository
+from app.api.dependencies.rate_limit import limit_auth_attempts
 from app.api.dependencies.service import get_service
-from app.core.config import get_app_settings
+from app.api.dependencies.settings import get_settings
 from app.core.settings.app import AppSettings
 from app.database.repositories.users import UsersRepository
 from app.models.user import User
 from app.schemas.user import UserInCreate, UserInSignIn, UserResponse
 from app.services.users import UsersService
 from app.utils import ERROR_RESPONSES, ServiceResult, handle_result
+from app.utils.response_cache import ResponseCache
 
 router = APIRouter()
 
@@ -43,13 +46,15 @@ async def get_user_by_token(
     response_model=UserResponse,
     responses=ERROR_RESPONSES,
     name="auth:signup",
+    dependencies=[Depends(limit_auth_attempts)],
 )
 async def signup_user(
     *,
     users_service: UsersService = Depends(get_service(UsersService)),
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     user_in: UserInCreate,
-    settings: AppSettings = Depends(get_app_settings),
+    settings: AppSettings = Depends(get_settings),
+    users_cache: ResponseCache = Depends(get_users_cache),
 ) -> ServiceResult:
     """
     Signup new users.
@@ -57,7 +62,9 @@ async def signup_user(
     secret_key = str(settings.secret_key.get_secret_value())
     result = await users_service.signup_user(users_repo=users_repo, user_in=user_in, secret_key=secret_key)
 
-    return await handle_result(result)
+    response = await handle_result(result)
+    users_cache.invalidate()
+    return response
 
 
 @router.post(
@@ -66,13 +73,14 @@ async def signup_user(
     response_model=UserResponse,
     responses=ERROR_RESPONSES,
     name="auth:signin",
+    dependencies=[Depends(limit_auth_attempts)],
 )
 async def signin_user(
     *,
     users_service: UsersService = Depends(get_service(UsersService)),
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     user_in: UserInSignIn,
-    settings: AppSettings = Depends(get_app_settings),
+    settings: AppSettings = Depends(get_settings),
 ) -> ServiceResult:
     """
     Create new users.
@@ -0,0 +1,141 @@
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.exceptions import HTTPException
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+
+from app.api.dependencies.database import get_db_engine
+from app.api.dependencies.debug import verify_debug_access
+from app.core import constant
+from app.utils import CustomizeLogger
+from app.utils.memory import memory_diagnostics
+
+router = APIRouter(dependencies=[Depends(verify_debug_access)])
+
+
+@router.get(
+    "/db/pool",
+    status_code=HTTP_200_OK,
+    name="debug:db-pool",
+)
+async def read_db_pool(
+    *,
+    engine: AsyncEngine = Depends(get_db_engine),
+) -> dict[str, Any]:
+    return {
+        "message": constant.SUCCESS_DB_POOL_STATUS,
+        "data": engine.pool.stats(),
+    }
+
+
+@router.get(
+    "/startup",
+    status_code=HTTP_200_OK,
+    name="debug:startup",
+)
+async def read_startup_report(request: Request) -> dict[str, Any]:
+    return {
+        "message": constant.SUCCESS_STARTUP_REPORT,
+        "data": request.app.state.startup.report(),
+    }
+
+
+@router.get(
+    "/logging",
+    status_code=HTTP_200_OK,
+    name="debug:logging",
+)
+async def read_logging_stats() -> dict[str, Any]:
+    writer = CustomizeLogger.json_writer
+    return {
+        "message": constant.SUCCESS_LOGGING_STATS,
+        "data": writer.stats() if writer is not None else None,
+    }
+
+
+@router.post(
+    "/memory/tracing",
+    status_code=HTTP_200_OK,
+    name="debug:memory-tracing-start",
+)
+async def start_memory_tracing(
+    *,
+    frames: int = Query(default=1, ge=1, le=50),
+) -> dict[str, Any]:
+    memory_diagnostics.start(frames)
+    return {
+        "message": constant.SUCCESS_MEMORY_TRACING_STARTED,
+        "data": memory_diagnostics.traced_memory(),
+    }
+
+
+@router.delete(
+    "/memory/tracing",
+    status_code=HTTP_200_OK,
+    name="debug:memory-tracing-stop",
+)
+async def stop_memory_tracing() -> dict[str, Any]:
+    memory_diagnostics.stop()
+    return {
+        "message": constant.SUCCESS_MEMORY_TRACING_STOPPED,
+        "data": None,
+    }
+
+
+@router.post(
+    "/memory/snapshots",
+    status_code=HTTP_200_OK,
+    name="debug:memory-snapshot",
+)
+def take_memory_snapshot() -> dict[str, Any]:
+    if not memory_diagnostics.is_tracing:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=constant.FAIL_MEMORY_TRACING_NOT_STARTED,
+        )
+
+    snapshot_id = memory_diagnostics.take_snapshot()
+    return {
+        "message": constant.SUCCESS_MEMORY_SNAPSHOT,
+        "data": {"id": snapshot_id, **memory_diagnostics.traced_memory()},
+    }
+
+
+@router.get(
+    "/memory/snapshots/diff",
+    status_code=HTTP_200_OK,
+    name="debug:memory-snapshot-diff",
+)
+def compare_memory_snapshots(
+    *,
+    first: int,
+    second: int,
+    group_by: Literal["filename", "lineno"] = "lineno",
+    limit: int = Query(default=20, ge=1, le=200),
+) -> dict[str, Any]:
+    if first not in memory_diagnostics.snapshots or second not in memory_diagnostics.snapshots:
+        raise HTTPException(
+            status_code=HTTP_404_NOT_FOUND,
+            detail=constant.FAIL_MEMORY_SNAPSHOT_NOT_FOUND,
+        )
+
+    return {
+        "message": constant.SUCCESS_MEMORY_SNAPSHOT_DIFF,
+        "data": memory_diagnostics.compare(first, second, group_by=group_by, limit=limit),
+    }
+
+
+@router.get(
+    "/memory/gc",
+    status_code=HTTP_200_OK,
+    name="debug:memory-gc",
+)
+def read_gc_stats(
+    *,
+    limit: int = Query(default=20, ge=1, le=200),
+) -> dict[str, Any]:
+    return {
+        "message": constant.SUCCESS_GC_STATS,
+        "data": memory_diagnostics.gc_stats(limit=limit),
+    }
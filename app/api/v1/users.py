@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response
 from starlette.status import HTTP_200_OK
 
 from app.api.dependencies.auth import get_current_user_auth
+from app.api.dependencies.cache import get_users_cache
 from app.api.dependencies.database import get_repository
 from app.api.dependencies.service import get_service
 from app.api.dependencies.users import get_users_filters
@@ -10,6 +12,7 @@ from app.models.user import User
 from app.schemas.user import UserInUpdate, UserResponse, UsersFilters
 from app.services.users import UsersService
 from app.utils import ERROR_RESPONSES, handle_result
+from app.utils.response_cache import ResponseCache
 
 router = APIRouter()
 
@@ -26,13 +29,17 @@ async def read_users(
     users_service: UsersService = Depends(get_service(UsersService)),
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     users_filters: UsersFilters = Depends(get_users_filters),
-):
-    result = await users_service.get_users(
-        users_repo=users_repo,
-        users_filters=users_filters,
-    )
+    users_cache: ResponseCache = Depends(get_users_cache),
+) -> Response:
+    async def load_users() -> Response:
+        result = await users_service.get_users(
+            users_repo=users_repo,
+            users_filters=users_filters,
+        )
 
-    return await handle_result(result)
+        return await handle_result(result)
+
+    return await users_cache.get_or_load((users_filters.skip, users_filters.limit), load_users)
 
 
 @router.get(
@@ -67,9 +74,12 @@ async def update_user(
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     user_in: UserInUpdate,
     token_user: User = Depends(get_current_user_auth()),
+    users_cache: ResponseCache = Depends(get_users_cache),
 ) -> UserResponse:
     result = await users_service.update_user(users_repo=users_repo, token_user=token_user, user_in=user_in)
-    return await handle_result(result)
+    response = await handle_result(result)
+    users_cache.invalidate()
+    return response
 
 
 @router.delete(
@@ -84,6 +94,9 @@ async def delete_user(
     users_service: UsersService = Depends(get_service(UsersService)),
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     token_user: User = Depends(get_current_user_auth()),
+    users_cache: ResponseCache = Depends(get_users_cache),
 ) -> UserResponse:
     result = await users_service.delete_user(users_repo=users_repo, token_user=token_user)
-    return await handle_result(result)
+    response = await handle_result(result)
+    users_cache.invalidate()
+    return response
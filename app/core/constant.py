@@ -9,6 +9,15 @@ SUCCESS_MATCHED_USER_TOKEN = "The user who matched with token."
 SUCCESS_MATCHED_USER_EMAIL = "The user who matched with email."
 SUCCESS_UPDATE_USER = "Updated user data successfully."
 SUCCESS_DELETE_USER = "Deleted user successfully."
+SUCCESS_DB_POOL_STATUS = "Database connection pool status."
+SUCCESS_LOGGING_STATS = "Log writer statistics."
+SUCCESS_MEMORY_TRACING_STARTED = "Started tracing memory allocations."
+SUCCESS_MEMORY_TRACING_STOPPED = "Stopped tracing memory allocations."
+SUCCESS_MEMORY_SNAPSHOT = "Took memory snapshot."
+SUCCESS_MEMORY_SNAPSHOT_DIFF = "Memory allocation differences between snapshots."
+SUCCESS_GC_STATS = "Garbage collector statistics."
+SUCCESS_STARTUP_REPORT = "Application start-up report."
+SUCCESS_READY = "The service is ready."
 
 # FAIL
 FAIL_VALIDATION_USER_DUPLICATED = "There is a duplicate user already."
@@ -22,5 +31,17 @@ FAIL_VALIDATION_MATCHED_FILTERED_USERS = "There are no user lists matched filter
 FAIL_AUTH_CHECK = "Authentication required."
 FAIL_AUTH_INVALID_TOKEN_PREFIX = "Invalid Token prefix."
 FAIL_AUTH_VALIDATION_CREDENTIAL = "Couldn't validate credentials."
+FAIL_AUTH_DEBUG_ACCESS = "Debug access required."
+
+FAIL_MEMORY_TRACING_NOT_STARTED = "Memory allocation tracing is not started."
+FAIL_MEMORY_SNAPSHOT_NOT_FOUND = "No memory snapshot matched with ID."
+
+FAIL_QUERY_BUDGET_EXCEEDED = "The request exceeded its database query budget."
+FAIL_SERVICE_OVERLOADED = "The service is overloaded, retry later."
+FAIL_RATE_LIMITED = "Too many attempts, retry later."
+FAIL_DEADLINE_EXCEEDED = "The request deadline was exceeded."
+FAIL_NOT_READY = "The service is not ready."
+FAIL_IDEMPOTENCY_KEY_INVALID = "The idempotency key must be 1 to 255 characters."
+FAIL_IDEMPOTENCY_KEY_REUSED = "The idempotency key was already used with a different request body."
 
 # --------
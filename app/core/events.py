@@ -2,19 +2,63 @@ from collections.abc import Callable
 
 from fastapi import FastAPI
 
+from app.api.openapi import build_openapi_document
+from app.core.security import load_hashing_backend
 from app.core.settings.app import AppSettings
-from app.database.events import close_db_connection, connect_to_db
+from app.database.events import close_db_connection, connect_to_db, warm_db_pool
+from app.services.users import warm_up_serializers
+from app.utils.loop_monitor import EventLoopMonitor
+from app.utils.metrics import mark_process_dead
 
 
 def create_start_app_handler(app: FastAPI, settings: AppSettings) -> Callable:
     async def start_app() -> None:
-        await connect_to_db(app, settings)
+        startup = app.state.startup
+
+        with startup.phase("connect_db"):
+            await connect_to_db(app, settings)
+
+        pool_warm = True
+        if settings.startup_warmup_enabled:
+            with startup.phase("warmup.openapi"):
+                app.state.openapi_document = build_openapi_document(app)
+            with startup.phase("warmup.serializers"):
+                warm_up_serializers()
+            with startup.phase("warmup.static"):
+                app.state.static_files.build()
+            with startup.phase("warmup.hashing"):
+                load_hashing_backend()
+            if settings.users_repository == "sql":
+                with startup.phase("warmup.db_pool"):
+                    pool_warm = await warm_db_pool(
+                        app.state.engine,
+                        min(settings.db_pool_prewarm_size, settings.db_pool_size + settings.db_max_overflow),
+                        timeout=settings.db_health_timeout_s,
+                    )
+        # a cold pool keeps /readyz failing until the database answers a ping
+        app.state.db_health.pool_warm = pool_warm
+        await app.state.db_health.start(lambda: app.state.engine)
+
+        if settings.loop_monitor_enabled:
+            app.state.loop_monitor = EventLoopMonitor(
+                interval=settings.loop_monitor_interval_ms / 1000,
+                block_threshold=settings.loop_block_threshold_ms / 1000,
+            )
+            app.state.loop_monitor.start()
+
+        startup.finish()
 
     return start_app
 
 
-def create_stop_app_handler(app):
-    async def stop_app():
-        await close_db_connection(app)
+def create_stop_app_handler(app: FastAPI, settings: AppSettings) -> Callable:
+    async def stop_app() -> None:
+        loop_monitor = getattr(app.state, "loop_monitor", None)
+        if loop_monitor is not None:
+            loop_monitor.stop()
+
+        await close_db_connection(app, settings)
+        # hypercorn has no worker-exit hook, so each worker retires its own gauges on the way out
+        mark_process_dead()
 
     return stop_app
@@ -1,16 +1,29 @@
 import bcrypt
 from passlib.context import CryptContext
 
+from app.utils.metrics import BCRYPT_TIME
+from app.utils.request_context import PhaseTimer
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_verify_time = BCRYPT_TIME.labels(operation="verify")
+_hash_time = BCRYPT_TIME.labels(operation="hash")
+
 
 def generate_salt() -> str:
     return bcrypt.gensalt().decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with _verify_time.time(), PhaseTimer("hash"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with _hash_time.time(), PhaseTimer("hash"):
+        return pwd_context.hash(password)
+
+
+def load_hashing_backend() -> None:
+    # passlib picks and self-tests the bcrypt backend on first use; do it before the first login does
+    pwd_context.handler("bcrypt").get_backend()
@@ -1,4 +1,5 @@
-from typing import Any
+import logging
+from typing import Any, Literal
 
 from pydantic import ConfigDict, SecretStr
 
@@ -25,6 +26,95 @@ class AppSettings(BaseAppSettings):
     jwt_token_prefix: str = "bearer"
     auth_header_key: str = "Authorization"
     allowed_hosts: list[str] = ["*"]
+    debug_token: SecretStr | None = None
+    debug_token_header_key: str = "X-Debug-Token"
+    logging_level: int = logging.INFO
+    logging_json: bool = False
+    logging_caller_info: bool = True
+    logging_access_sample_rate: float = 1.0
+    metrics_enabled: bool = True
+    server_timing_enabled: bool = False
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: float = 100.0
+    loop_block_threshold_ms: float = 250.0
+    profiling_enabled: bool = False
+    profiling_interval_ms: float = 1.0
+    profiling_dir: str = "/var/logs/app/profiles"
+    tracing_enabled: bool = False
+    tracing_sample_rate: float = 0.01
+    tracing_file: str = "/var/logs/app/traces.json"
+    tracing_max_bytes: int = 50 * 1024 * 1024
+    tracing_backup_count: int = 5
+    load_shedding_enabled: bool = True
+    load_shedding_limits: dict[str, int] = {"default": 50, "auth": 4}
+    # budgets without a limit, like "probe" and "monitoring", are never shed; scrapes matter most under overload
+    load_shedding_routes: dict[str, str] = {
+        "auth:signin": "auth",
+        "auth:signup": "auth",
+        "health:live": "probe",
+        "health:ready": "probe",
+        "monitoring:metrics": "monitoring",
+    }
+    load_shedding_max_queue: int = 100
+    load_shedding_target_delay_ms: float = 50.0
+    load_shedding_interval_ms: float = 500.0
+    load_shedding_retry_after_s: float = 1.0
+    idempotency_enabled: bool = True
+    idempotency_routes: list[str] = ["auth:signup"]
+    idempotency_header_key: str = "Idempotency-Key"
+    # a replayed signup carries an access token, so responses are kept no longer than tokens live
+    idempotency_ttl_s: float = 30 * 60
+    idempotency_max_keys: int = 10_000
+    # "memory" is per worker, so a retry that reaches another worker runs again; use "redis" with several
+    idempotency_backend: Literal["memory", "redis"] = "memory"
+    idempotency_redis_url: str | None = None
+    idempotency_pending_ttl_s: float = 60.0
+    users_cache_ttl_s: float = 2.0
+    users_cache_stale_s: float = 10.0
+    users_cache_max_entries: int = 256
+    users_cache_max_bytes: int = 16 * 1024 * 1024
+    rate_limit_enabled: bool = True
+    rate_limit_backend: Literal["memory", "redis"] = "memory"
+    rate_limit_redis_url: str | None = None
+    rate_limit_auth_ip_limit: int = 30
+    rate_limit_auth_ip_window_s: float = 60.0
+    rate_limit_auth_email_limit: int = 10
+    rate_limit_auth_email_window_s: float = 300.0
+    startup_warmup_enabled: bool = True
+    startup_budget_ms: float = 5000.0
+
+    # server settings
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int | None = None
+    server_backlog: int = 2048
+    server_keep_alive_timeout: float = 5.0
+    server_max_requests: int | None = 10000
+    server_max_requests_jitter: int = 1000
+    server_graceful_timeout: float = 20.0
+    server_certfile: str | None = None
+    server_keyfile: str | None = None
+
+    # database settings
+    db_echo: bool = False
+    db_pool_size: int = 50
+    db_max_overflow: int = 0
+    db_pool_timeout: float = 30.0
+    db_max_connections: int = 100
+    db_drain_timeout: float = 5.0
+    db_connection_hold_threshold_ms: float = 5000.0
+    db_slow_query_threshold_ms: float = 200.0
+    db_query_budget: int | None = None
+    db_pool_prewarm_size: int = 5
+    # "memory" keeps users in process, to measure the routes without Postgres
+    users_repository: Literal["sql", "memory"] = "sql"
+    db_health_interval_s: float = 5.0
+    db_health_timeout_s: float = 1.0
+
+    request_timeout_ms: float | None = 10000.0
+    request_timeouts_ms: dict[str, float] = {}
+    request_timeout_max_ms: float = 30000.0
+    request_timeout_header_key: str = "X-Request-Timeout"
 
     @property
     def fastapi_kwargs(self) -> dict[str, Any]:
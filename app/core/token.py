@@ -6,6 +6,7 @@ from pydantic import ValidationError
 from app.models.user import User
 from app.schemas.token import TokenBase, TokenUser
 from app.schemas.user import UserTokenData
+from app.utils.metrics import JWT_DECODE_TIME
 
 TOKEN_TYPE = "bearer"
 JWT_SUBJECT = "access"
@@ -39,7 +40,8 @@ def create_token_for_user(user: User, secret_key: str) -> UserTokenData:
 
 def get_user_from_token(token: str, secret_key: str) -> str:
     try:
-        decoded_user = jwt.decode(token, secret_key, algorithms=ALGORITHM)
+        with JWT_DECODE_TIME.time():
+            decoded_user = jwt.decode(token, secret_key, algorithms=ALGORITHM)
         return TokenUser(**decoded_user)
 
     except JWTError as decode_error:
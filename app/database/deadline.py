@@ -0,0 +1,49 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.status import HTTP_504_GATEWAY_TIMEOUT
+
+from app.core import constant
+from app.database.monitoring import UNTRACKED_OPTION
+from app.utils import AppExceptionCase, response_5xx
+from app.utils.request_context import get_request_context
+
+QUERY_CANCELED_SQLSTATE = "57014"
+# how long after the deadline the client side gives up; Postgres must cancel the statement
+# first, or asyncpg is cancelled mid-query and the connection returns in an unknown state
+DEADLINE_GRACE_S = 0.1
+
+
+def deadline_exceeded() -> AppExceptionCase:
+    return response_5xx(
+        status_code=HTTP_504_GATEWAY_TIMEOUT,
+        context={"reason": constant.FAIL_DEADLINE_EXCEEDED},
+    )
+
+
+def remaining_time() -> float | None:
+    context = get_request_context()
+    return context.remaining() if context is not None else None
+
+
+class DeadlineSession(Session):
+    """Session whose transactions inherit the current request's deadline.
+
+    Each transaction starts with ``SET LOCAL statement_timeout`` set to the time the request
+    has left, so Postgres cancels a statement that outlives its request instead of holding
+    the pooled connection after the client has given up.
+    """
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def _apply_statement_timeout(session, transaction, connection) -> None:
+    remaining = remaining_time()
+    if remaining is None:
+        return
+    if remaining <= 0:
+        raise deadline_exceeded()
+
+    # not one of the request's queries: it must not count against the budget, timings or traces
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {max(int(remaining * 1000), 1)}",
+        execution_options={UNTRACKED_OPTION: True},
+    )
@@ -1,27 +1,91 @@
+import asyncio
 import logging
+from typing import Any
 
 from fastapi import FastAPI
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.settings.app import AppSettings
+from app.database.deadline import DeadlineSession
+from app.database.monitoring import install_query_hooks
+from app.database.pool import InstrumentedPool, watch_pool
 
 logger = logging.getLogger(__name__)
 
 
+def create_db_engine(settings: AppSettings, **engine_kwargs: Any) -> AsyncEngine:
+    engine_kwargs = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "echo": settings.db_echo,
+        "future": True,
+        **engine_kwargs,
+    }
+    engine = create_async_engine(url=str(settings.db_url), **engine_kwargs)
+    install_query_hooks(engine, slow_query_threshold=settings.db_slow_query_threshold_ms / 1000)
+    if isinstance(engine.pool, InstrumentedPool):
+        engine.pool.hold_threshold = settings.db_connection_hold_threshold_ms / 1000
+    return engine
+
+
+def create_session_factory(bind: AsyncEngine | AsyncConnection, **session_kwargs: Any) -> sessionmaker:
+    return sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        sync_session_class=DeadlineSession,
+        expire_on_commit=False,
+        autoflush=True,
+        **session_kwargs,
+    )
+
+
 async def connect_to_db(app: FastAPI, settings: AppSettings) -> None:
     logger.info("Connecting to database...")
 
-    engine = create_async_engine(url=str(settings.db_url), pool_size=50, max_overflow=0, echo=True, future=True)
-    async_session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=True)
+    engine = create_db_engine(settings)
+    async_session_factory = create_session_factory(engine)
+    app.state.engine = engine
     app.state.pool = async_session_factory
+    app.state.pool_watcher = asyncio.create_task(watch_pool(engine.pool, interval=engine.pool.hold_threshold))
 
     logger.info("Connected to database.")
 
 
-async def close_db_connection(app: FastAPI) -> None:
+async def warm_db_pool(engine: AsyncEngine, size: int, timeout: float) -> bool:
+    """Open ``size`` pooled connections up front so the first requests don't pay for the handshakes.
+
+    Returns whether every connection opened. A database that is down at boot doesn't stop
+    the start-up: the failure is logged and the pool fills on demand once it is back.
+    """
+
+    async def _open_connection() -> None:
+        async with asyncio.timeout(timeout), engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    results = await asyncio.gather(*(_open_connection() for _ in range(size)), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        logger.warning("Could not warm the database pool, %d of %d connections failed: %r", len(errors), size, errors[0])
+        return False
+
+    logger.info("Opened %d database connections.", size)
+    return True
+
+
+async def close_db_connection(app: FastAPI, settings: AppSettings) -> None:
     logger.info("Closing database connection...")
 
-    # app.state.pool.close_all()
+    # readiness probes report draining from here on, so no new traffic is routed to us
+    app.state.db_health.draining = True
+    app.state.db_health.stop()
+    app.state.pool_watcher.cancel()
+    try:
+        await asyncio.wait_for(app.state.engine.dispose(), timeout=settings.db_drain_timeout)
+    except TimeoutError:
+        logger.warning("Database connections not drained within %.1fs.", settings.db_drain_timeout)
 
     logger.info("Database connection closed.")
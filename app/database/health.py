@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHealth:
+    """Readiness of the database layer, kept up to date off the request path.
+
+    A background task pings the database every ``interval`` seconds and caches the result,
+    so readiness probes only read attributes and add no load to Postgres however often
+    they arrive. The database counts as reachable while the last ping succeeded and is no
+    older than ``stale_after`` seconds. With ``enabled`` off the app runs without a database,
+    so there is nothing to warm up or ping.
+    """
+
+    def __init__(self, interval: float, timeout: float, stale_after: float | None = None, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after if stale_after is not None else interval * 3
+        self.pool_warm = False
+        self.draining = False
+        self.last_ping_ok = False
+        self.last_ping_at: float | None = None
+        self.last_ping_ms: float | None = None
+        self.last_error: str | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def reachable(self) -> bool:
+        if not self.enabled:
+            return True
+        return self.last_ping_ok and self.last_ping_at is not None and monotonic() - self.last_ping_at <= self.stale_after
+
+    @property
+    def ready(self) -> bool:
+        return (self.pool_warm or not self.enabled) and self.reachable and not self.draining
+
+    async def start(self, get_engine: Callable[[], AsyncEngine]) -> None:
+        if not self.enabled:
+            return
+        # the first result is in before start-up completes, so probes never see a missing one
+        await self.ping(get_engine())
+        self._task = asyncio.get_running_loop().create_task(self._watch(get_engine))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def ping(self, engine: AsyncEngine) -> None:
+        started_at = monotonic()
+        try:
+            async with asyncio.timeout(self.timeout), engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            if self.last_ping_ok:
+                logger.warning("Database ping failed: %r", e)
+            self.last_ping_ok = False
+            self.last_error = repr(e)
+        else:
+            self.last_ping_ok = True
+            self.last_error = None
+            # a pool that couldn't be warmed at start-up fills on demand from here on
+            self.pool_warm = True
+        self.last_ping_at = now = monotonic()
+        self.last_ping_ms = round((now - started_at) * 1000, 3)
+
+    def report(self, engine: AsyncEngine | None = None) -> dict[str, Any]:
+        pool = {"warm": self.pool_warm}
+        if engine is not None:
+            pool.update(size=engine.pool.size(), checked_out=engine.pool.checkedout(), idle=engine.pool.checkedin())
+        return {
+            "ready": self.ready,
+            "draining": self.draining,
+            "pool": pool,
+            "database": {
+                "reachable": self.reachable,
+                "checked_s_ago": round(monotonic() - self.last_ping_at, 3) if self.last_ping_at is not None else None,
+                "ping_ms": self.last_ping_ms,
+                "error": self.last_error,
+            },
+        }
+
+    async def _watch(self, get_engine: Callable[[], AsyncEngine]) -> None:
+        while not self.draining:
+            await asyncio.sleep(self.interval)
+            await self.ping(get_engine())
@@ -0,0 +1,78 @@
+import logging
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import constant
+from app.utils import response_5xx
+from app.utils.request_context import get_request_context
+from app.utils.tracing import record_span
+
+logger = logging.getLogger(__name__)
+
+QUERY_START_TIME_KEY = "query_start_time"
+# execution option for housekeeping statements the app issues itself, kept out of every query hook
+UNTRACKED_OPTION = "untracked"
+
+
+def _untracked(context) -> bool:
+    return context is not None and context.execution_options.get(UNTRACKED_OPTION, False)
+
+
+def install_query_hooks(engine: AsyncEngine, *, slow_query_threshold: float) -> None:
+    """Time every statement executed on ``engine`` and account it to the current request.
+
+    Statements slower than ``slow_query_threshold`` seconds are logged as warnings. When the
+    request carries a query budget, the statement that would exceed it is refused.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if _untracked(context):
+            return
+
+        request = get_request_context()
+        if request is not None:
+            request.query_count += 1
+            if request.query_budget is not None and request.query_count > request.query_budget:
+                raise response_5xx(
+                    context={
+                        "reason": constant.FAIL_QUERY_BUDGET_EXCEEDED,
+                        "route": request.route_name,
+                        "budget": request.query_budget,
+                    },
+                )
+
+        conn.info.setdefault(QUERY_START_TIME_KEY, []).append(perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if _untracked(context):
+            return
+
+        started_at = conn.info[QUERY_START_TIME_KEY].pop()
+        finished_at = perf_counter()
+        elapsed = finished_at - started_at
+        record_span("db.query", started_at, finished_at, statement=statement)
+
+        request = get_request_context()
+        if request is not None:
+            request.query_time += elapsed
+
+        if elapsed >= slow_query_threshold:
+            logger.warning(
+                "Slow query %.1fms correlation_id=%s route=%s: %s",
+                elapsed * 1000,
+                request.correlation_id if request is not None else None,
+                request.route_name if request is not None else None,
+                statement,
+            )
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _handle_error(exception_context) -> None:
+        conn = exception_context.connection
+        if _untracked(exception_context.execution_context):
+            return
+        if conn is not None and conn.info.get(QUERY_START_TIME_KEY):
+            conn.info[QUERY_START_TIME_KEY].pop()
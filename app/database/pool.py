@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
+
+from app.utils.request_context import get_request_context
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ConnectionCheckout:
+    acquired_at: float
+    route: str | None = None
+    correlation_id: str | None = None
+    flagged: bool = False
+
+    @property
+    def held_for(self) -> float:
+        return perf_counter() - self.acquired_at
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "route": self.route,
+            "correlation_id": self.correlation_id,
+            "held_ms": round(self.held_for * 1000, 1),
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool recording checkout wait time, timeouts and who holds each connection."""
+
+    hold_threshold: float = 5.0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.held: dict[int, ConnectionCheckout] = {}
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = perf_counter() - started_at
+            self.checkouts += 1
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.hold_threshold = self.hold_threshold
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        record = super()._do_get()
+        request = get_request_context()
+        self.held[id(record)] = ConnectionCheckout(
+            acquired_at=perf_counter(),
+            route=request.route_name if request is not None else None,
+            correlation_id=request.correlation_id if request is not None else None,
+        )
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        checkout = self.held.pop(id(record), None)
+        if checkout is not None and checkout.held_for >= self.hold_threshold:
+            logger.warning(
+                "Connection released after %.1fs route=%s correlation_id=%s",
+                checkout.held_for,
+                checkout.route,
+                checkout.correlation_id,
+            )
+        super()._do_return_conn(record)
+
+    def long_held(self) -> list[ConnectionCheckout]:
+        return [checkout for checkout in self.held.values() if checkout.held_for >= self.hold_threshold]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.wait_time / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait_time * 1000, 3),
+            "long_held": [checkout.as_dict() for checkout in self.long_held()],
+        }
+
+
+async def watch_pool(pool: InstrumentedPool, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        for checkout in pool.long_held():
+            if checkout.flagged:
+                continue
+            checkout.flagged = True
+            logger.warning(
+                "Connection held for %.1fs route=%s correlation_id=%s",
+                checkout.held_for,
+                checkout.route,
+                checkout.correlation_id,
+            )
@@ -1,7 +1,11 @@
-from sqlalchemy.exc import DatabaseError
+import asyncio
+
+from sqlalchemy.exc import DatabaseError, DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.deadline import DEADLINE_GRACE_S, QUERY_CANCELED_SQLSTATE, deadline_exceeded, remaining_time
 from app.utils import AppExceptionCase
+from app.utils.tracing import SpanRecorder
 
 
 class BaseRepository:
@@ -28,10 +32,28 @@ def db_error_handler(func) -> callable:
         AppExceptionCase: [description]
     """
 
+    span_name = f"repository.{func.__qualname__}"
+
     async def wrapper(*args, **kwargs):
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise deadline_exceeded()
+
+        # Postgres cancels a statement at the deadline through ``statement_timeout``; this one is
+        # only a backstop for time spent outside a statement, e.g. waiting for a connection
+        timeout = remaining + DEADLINE_GRACE_S if remaining is not None else None
         try:
-            return await func(*args, **kwargs)
-        except DatabaseError as e:
+            with SpanRecorder(span_name):
+                async with asyncio.timeout(timeout):
+                    return await func(*args, **kwargs)
+        except TimeoutError:
+            raise deadline_exceeded() from None
+        except DBAPIError as e:
+            # Postgres cancelled the statement when it hit the ``statement_timeout`` set from the deadline
+            if getattr(e.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE:
+                raise deadline_exceeded() from None
+            if not isinstance(e, DatabaseError):
+                raise
             db_error_context = e.orig.__context__.__str__()
             raise AppExceptionCase(
                 context={"reason": db_error_context, "code": e.code},
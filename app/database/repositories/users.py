@@ -51,7 +51,7 @@ class UsersRepository(BaseRepository):
         skip: int = 0,
         limit: int = 100,
     ) -> list[User]:
-        query = select(User).offset(skip).limit(limit)
+        query = select(User).order_by(User.id).offset(skip).limit(limit)
 
         raw_results = await self.connection.execute(query)
         results = raw_results.scalars().all()
@@ -0,0 +1,110 @@
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from app.database.repositories.users import UsersRepository
+from app.models.user import User
+from app.schemas.user import UserInCreate, UserInDB, UserInUpdate
+
+USER_FIELDS = ("id", "username", "email", "salt", "hashed_password", "created_at", "updated_at", "deleted_at")
+
+
+def _copy(user: User) -> User:
+    return User(**{field: getattr(user, field) for field in USER_FIELDS})
+
+
+class InMemoryUsersRepository(UsersRepository):
+    """``UsersRepository`` kept in process memory, for benchmarks and tests that leave Postgres out.
+
+    Users are indexed by id, and live (not deleted) users by email and username, which
+    gives the SQL repository's lookups: soft-deleted users still page through
+    ``get_filtered_users`` and resolve by id, but not by email or as duplicates. Ids only
+    grow and rows are never removed, so the id list stays sorted and a page is a slice of it.
+    Returned users are copies, so changes only persist through the repository's methods.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(None)
+        self._users: dict[int, User] = {}
+        self._ids: list[int] = []
+        self._live_by_email: dict[str, int] = {}
+        self._live_by_username: dict[str, int] = {}
+
+    def load_users(self, users: Iterable[User]) -> None:
+        """Add users as they are, like the SQL repository's table being filled by ``COPY``."""
+        for user in users:
+            self._insert(_copy(user))
+
+    async def get_user_by_id(self, *, user_id: int) -> User:
+        user = self._users.get(user_id)
+        return _copy(user) if user is not None else None
+
+    async def get_user_by_email(self, *, email: str) -> User:
+        user_id = self._live_by_email.get(email)
+        return _copy(self._users[user_id]) if user_id is not None else None
+
+    async def get_duplicated_user(self, *, user_in: UserInCreate) -> User:
+        user_id = self._live_by_username.get(user_in.username, self._live_by_email.get(user_in.email))
+        return _copy(self._users[user_id]) if user_id is not None else None
+
+    async def get_filtered_users(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[User]:
+        return [_copy(self._users[user_id]) for user_id in self._ids[skip : skip + limit]]
+
+    async def signup_user(self, *, user_in: UserInCreate) -> User:
+        user_in_db_obj = UserInDB(
+            username=user_in.username,
+            email=user_in.email,
+        )
+        user_in_db_obj.change_password(user_in.password)
+
+        now = datetime.now(UTC)
+        created_user = User(
+            **user_in_db_obj.model_dump(exclude_none=True),
+            id=self._ids[-1] + 1 if self._ids else 1,
+            created_at=now,
+            updated_at=now,
+        )
+        self._insert(created_user)
+        return _copy(created_user)
+
+    async def update_user(self, *, user: User, user_in: UserInUpdate) -> User:
+        stored = self._users[user.id]
+        self._unindex(stored)
+
+        user_in_obj = user_in.model_dump(exclude_unset=True)
+        if user_in.password:
+            stored.change_password(user_in.password)
+        for key, val in user_in_obj.items():
+            setattr(stored, key, val)
+        stored.updated_at = datetime.now(UTC)
+
+        self._index(stored)
+        return _copy(stored)
+
+    async def delete_user(self, *, user: User) -> User:
+        stored = self._users[user.id]
+        self._unindex(stored)
+        stored.deleted_at = stored.updated_at = datetime.now(UTC)
+        return _copy(stored)
+
+    def _insert(self, user: User) -> None:
+        if self._ids and user.id <= self._ids[-1]:
+            raise ValueError(f"user ids must increase, got {user.id} after {self._ids[-1]}")
+        self._users[user.id] = user
+        self._ids.append(user.id)
+        self._index(user)
+
+    def _index(self, user: User) -> None:
+        if user.deleted_at is None:
+            self._live_by_email[user.email] = user.id
+            self._live_by_username[user.username] = user.id
+
+    def _unindex(self, user: User) -> None:
+        if self._live_by_email.get(user.email) == user.id:
+            del self._live_by_email[user.email]
+        if self._live_by_username.get(user.username) == user.id:
+            del self._live_by_username[user.username]
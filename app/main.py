@@ -1,4 +1,6 @@
+import logging
 from pathlib import Path
+from time import perf_counter
 
 from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI
@@ -9,11 +11,25 @@ from fastapi.openapi.docs import (
     get_swagger_ui_html,
     get_swagger_ui_oauth2_redirect_html,
 )
-from starlette.staticfiles import StaticFiles
 
+from app import IMPORT_STARTED_AT
+from app.api import health, monitoring, openapi
+from app.api.dependencies.database import override_repository
 from app.api.v1 import api_router
 from app.core import settings
 from app.core.events import create_start_app_handler, create_stop_app_handler
+from app.database.health import DatabaseHealth
+from app.database.repositories.users import UsersRepository
+from app.database.repositories.users_memory import InMemoryUsersRepository
+from app.middleware import (
+    DeadlinePolicy,
+    IdempotencyMiddleware,
+    LoadSheddingMiddleware,
+    MetricsMiddleware,
+    RequestContextMiddleware,
+    RouteNameResolver,
+    ServerTimingMiddleware,
+)
 from app.utils import (
     AppExceptionCase,
     CustomizeLogger,
@@ -21,12 +37,70 @@ from app.utils import (
     http_exception_handler,
     request_validation_exception_handler,
 )
+from app.utils.rate_limit import create_rate_limit_backend
+from app.utils.response_cache import ResponseCache
+from app.utils.startup import StartupTimer
+from app.utils.static_files import PrecompressedStaticFiles
 
 config_path = Path(__file__).with_name("logging_conf.json")
 
+import_time = perf_counter() - IMPORT_STARTED_AT
+
 
 def create_app() -> FastAPI:
-    _app = FastAPI(**settings.fastapi_kwargs)
+    started_at = perf_counter()
+    # the docs pages and the schema are served by the routes below, from precomputed bytes
+    _app = FastAPI(**{**settings.fastapi_kwargs, "docs_url": None, "redoc_url": None, "openapi_url": None})
+    _app.state.startup = StartupTimer(budget=settings.startup_budget_ms / 1000)
+    _app.state.startup.record("import", import_time)
+    _app.state.users_cache = ResponseCache(
+        name="users",
+        ttl=settings.users_cache_ttl_s,
+        stale_ttl=settings.users_cache_stale_s,
+        max_entries=settings.users_cache_max_entries,
+        max_bytes=settings.users_cache_max_bytes,
+    )
+    _app.state.db_health = DatabaseHealth(
+        interval=settings.db_health_interval_s,
+        timeout=settings.db_health_timeout_s,
+        enabled=settings.users_repository == "sql",
+    )
+
+    if settings.users_repository == "memory":
+        _app.state.users_repository = InMemoryUsersRepository()
+        override_repository(_app, UsersRepository, _app.state.users_repository)
+
+    # shared by the middlewares below, so each request is matched against the routes once
+    _app.state.route_names = route_names = RouteNameResolver()
+
+    if settings.rate_limit_enabled:
+        _app.state.rate_limiter = create_rate_limit_backend(settings)
+
+    if settings.load_shedding_enabled:
+        _app.add_middleware(LoadSheddingMiddleware, settings=settings, route_names=route_names)
+
+    if settings.idempotency_enabled:
+        # outside load shedding, so replays and waiting duplicates don't take a slot
+        _app.add_middleware(IdempotencyMiddleware, settings=settings, route_names=route_names)
+
+    if settings.metrics_enabled:
+        _app.add_middleware(MetricsMiddleware, route_names=route_names)
+        _app.include_router(monitoring.router)
+
+    if settings.server_timing_enabled:
+        _app.add_middleware(ServerTimingMiddleware)
+
+    _app.add_middleware(
+        RequestContextMiddleware,
+        query_budget=settings.db_query_budget,
+        deadlines=DeadlinePolicy.from_settings(settings, route_names=route_names),
+    )
+
+    if settings.profiling_enabled:
+        # rarely enabled, so only pay for the import when it is
+        from app.middleware.profiler import ProfilerMiddleware
+
+        _app.add_middleware(ProfilerMiddleware, settings=settings)
 
     _app.add_middleware(
         CORSMiddleware,
@@ -37,30 +111,45 @@ def create_app() -> FastAPI:
     )
 
     _app.add_middleware(CorrelationIdMiddleware)
-    _app.logger = CustomizeLogger.make_logger(config_path)
+    if settings.tracing_enabled:
+        from app.middleware.tracing import install_tracing
+
+        install_tracing(_app, settings)
+
+    _app.logger = CustomizeLogger.make_logger(
+        config_path,
+        level=logging.getLevelName(settings.logging_level),
+        json=settings.logging_json,
+        caller_info=settings.logging_caller_info,
+        access_log_sample_rate=settings.logging_access_sample_rate,
+    )
     _app.include_router(api_router, prefix=settings.api_v1_prefix)
-    _app.mount("/static", StaticFiles(directory="app/static"))
+    _app.include_router(openapi.router)
+    _app.include_router(health.router)
+    static_files = PrecompressedStaticFiles(directory="app/static")
+    _app.state.static_files = static_files
+    _app.mount("/static", static_files)
 
-    @_app.get("/docs", include_in_schema=False)
+    @_app.get(settings.docs_url, include_in_schema=False)
     async def custom_swagger_ui_html():
         return get_swagger_ui_html(
-            openapi_url=_app.openapi_url,
+            openapi_url=f"{settings.openapi_prefix}{settings.openapi_url}",
             title=_app.title + " - Swagger UI custom",
             oauth2_redirect_url=_app.swagger_ui_oauth2_redirect_url,
-            swagger_js_url=f"{settings.openapi_prefix}/static/swagger-ui-bundle.js",
-            swagger_css_url=f"{settings.openapi_prefix}/static/swagger-ui.css",
+            swagger_js_url=f"{settings.openapi_prefix}/static/{static_files.url_path('swagger-ui-bundle.js')}",
+            swagger_css_url=f"{settings.openapi_prefix}/static/{static_files.url_path('swagger-ui.css')}",
         )
 
     @_app.get(_app.swagger_ui_oauth2_redirect_url, include_in_schema=False)
     async def swagger_ui_redirect():
         return get_swagger_ui_oauth2_redirect_html()
 
-    @_app.get("/redoc", include_in_schema=False)
+    @_app.get(settings.redoc_url, include_in_schema=False)
     async def redoc_html():
         return get_redoc_html(
-            openapi_url=_app.openapi_url,
+            openapi_url=f"{settings.openapi_prefix}{settings.openapi_url}",
             title=_app.title + " - ReDoc",
-            redoc_js_url=f"{settings.openapi_prefix}/static/redoc.standalone.js",
+            redoc_js_url=f"{settings.openapi_prefix}/static/{static_files.url_path('redoc.standalone.js')}",
         )
 
     @_app.exception_handler(HTTPException)
@@ -76,8 +165,9 @@ def create_app() -> FastAPI:
         return await app_exception_handler(request, e)
 
     _app.add_event_handler("startup", create_start_app_handler(_app, settings))
-    _app.add_event_handler("shutdown", create_stop_app_handler(_app))
+    _app.add_event_handler("shutdown", create_stop_app_handler(_app, settings))
 
+    _app.state.startup.record("create_app", perf_counter() - started_at)
     return _app
 
 
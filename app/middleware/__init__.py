@@ -0,0 +1,7 @@
+from .deadline import DeadlinePolicy
+from .idempotency import IdempotencyMiddleware
+from .load_shedding import LoadSheddingMiddleware
+from .metrics import MetricsMiddleware
+from .request_context import RequestContextMiddleware
+from .routing import RouteNameResolver
+from .server_timing import ServerTimingMiddleware
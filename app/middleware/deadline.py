@@ -0,0 +1,44 @@
+from starlette.types import Scope
+
+from app.core.settings.app import AppSettings
+from app.middleware.routing import RouteNameResolver
+
+
+class DeadlinePolicy:
+    """Decide how long a request may run: a per-route timeout, else the default.
+
+    A client may ask for a different timeout in milliseconds through ``header_key``; it is
+    capped at ``maximum`` so callers can shorten deadlines but not hold connections forever.
+    """
+
+    def __init__(self, default: float | None, per_route: dict[str, float], maximum: float, header_key: str, route_names: RouteNameResolver) -> None:
+        self.default = default
+        self.per_route = per_route
+        self.maximum = maximum
+        self.header_key = header_key.lower().encode("latin-1")
+        self.resolve_route_name = route_names
+
+    @classmethod
+    def from_settings(cls, settings: AppSettings, route_names: RouteNameResolver) -> "DeadlinePolicy":
+        return cls(
+            default=settings.request_timeout_ms / 1000 if settings.request_timeout_ms is not None else None,
+            per_route={route: timeout / 1000 for route, timeout in settings.request_timeouts_ms.items()},
+            maximum=settings.request_timeout_max_ms / 1000,
+            header_key=settings.request_timeout_header_key,
+            route_names=route_names,
+        )
+
+    def timeout(self, scope: Scope) -> float | None:
+        for name, value in scope["headers"]:
+            if name == self.header_key:
+                try:
+                    requested = float(value) / 1000
+                except ValueError:
+                    break
+                if requested > 0:
+                    return min(requested, self.maximum)
+                break
+
+        if self.per_route:
+            return self.per_route.get(self.resolve_route_name(scope), self.default)
+        return self.default
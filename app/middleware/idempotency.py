@@ -0,0 +1,126 @@
+from hashlib import sha256
+
+from starlette.responses import JSONResponse
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_422_UNPROCESSABLE_ENTITY, HTTP_429_TOO_MANY_REQUESTS
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import constant
+from app.core.settings.app import AppSettings
+from app.core.token import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.middleware.routing import RouteNameResolver
+from app.utils.idempotency import StoredResponse, create_idempotency_backend
+from app.utils.metrics import REQUESTS_REPLAYED
+
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+
+
+class IdempotencyMiddleware:
+    """Run a POST carrying an ``Idempotency-Key`` once and replay its response to retries.
+
+    Only routes listed in ``idempotency_routes`` take part. The first response is stored
+    byte for byte under the key, together with a hash of the request body; a retry with the
+    same key and body gets it back without reaching the application, a concurrent retry
+    waits for the first execution to finish, and reusing a key for a different body is
+    rejected. Server errors and 429s are not stored, so a retry of those runs again.
+
+    Responses are kept for ``idempotency_ttl_s``, but never longer than an access token lives,
+    since a replayed signup hands the stored token out again.
+    """
+
+    def __init__(self, app: ASGIApp, settings: AppSettings, route_names: RouteNameResolver) -> None:
+        self.app = app
+        self.routes = frozenset(settings.idempotency_routes)
+        self.header_key = settings.idempotency_header_key.lower().encode("latin-1")
+        self.store = create_idempotency_backend(settings, ttl=min(settings.idempotency_ttl_s, ACCESS_TOKEN_EXPIRE_MINUTES * 60))
+        self.resolve_route_name = route_names
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = authorization = None
+        for name, value in scope["headers"]:
+            if name == self.header_key:
+                idempotency_key = value
+            elif name == b"authorization":
+                authorization = value
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        route = self.resolve_route_name(scope)
+        if route not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": constant.FAIL_IDEMPOTENCY_KEY_INVALID}, status_code=HTTP_400_BAD_REQUEST)
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        # keys are scoped to the route and the caller, so two clients can't collide on one
+        key = sha256(b"\0".join((route.encode(), authorization or b"", idempotency_key))).hexdigest()
+        fingerprint = sha256(body).hexdigest()
+
+        while True:
+            record, claimed = await self.store.claim(key, fingerprint)
+            if claimed:
+                break
+            if record.fingerprint != fingerprint:
+                response = JSONResponse({"detail": constant.FAIL_IDEMPOTENCY_KEY_REUSED}, status_code=HTTP_422_UNPROCESSABLE_ENTITY)
+                await response(scope, receive, send)
+                return
+            if record.response is None:
+                # the first request is still running; if it fails the key is freed and we run instead
+                await self.store.wait(key, record)
+                continue
+
+            REQUESTS_REPLAYED.labels(route).inc()
+            await _replay(record.response, send)
+            return
+
+        status = 0
+        headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+
+        async def replay_receive() -> Message:
+            nonlocal body
+            if body is None:
+                return await receive()
+            message = {"type": "http.request", "body": body, "more_body": False}
+            body = None
+            return message
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers.extend(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        stored = None
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            if status and status < 500 and status != HTTP_429_TOO_MANY_REQUESTS:
+                stored = StoredResponse(status=status, headers=headers, body=b"".join(chunks))
+        finally:
+            await self.store.complete(key, record, stored)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _replay(response: StoredResponse, send: Send) -> None:
+    await send({"type": "http.response.start", "status": response.status, "headers": [*response.headers, REPLAYED_HEADER]})
+    await send({"type": "http.response.body", "body": response.body})
@@ -0,0 +1,41 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.routing import RouteNameResolver
+from app.utils.metrics import DB_QUERIES, DB_TIME, REQUEST_LATENCY, REQUESTS_IN_FLIGHT
+from app.utils.request_context import get_request_context
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, route_names: RouteNameResolver) -> None:
+        self.app = app
+        self.resolve_route_name = route_names
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self.resolve_route_name(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(route)
+        in_flight.inc()
+        started_at = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            REQUEST_LATENCY.labels(route, scope["method"], str(status_code)).observe(perf_counter() - started_at)
+
+            context = get_request_context()
+            if context is not None and context.query_count:
+                DB_TIME.labels(route).observe(context.query_time)
+                DB_QUERIES.labels(route).observe(context.query_count)
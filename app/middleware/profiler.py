@@ -0,0 +1,59 @@
+import threading
+from pathlib import Path
+
+from asgi_correlation_id.context import correlation_id
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.dependencies.debug import has_debug_access
+from app.core.settings.app import AppSettings
+from app.utils.profiler import StackSampler
+
+PROFILE_HEADER_KEY = "X-Profile"
+PROFILE_QUERY_KEY = "profile"
+PROFILE_FILE_HEADER_KEY = "X-Profile-File"
+
+
+class ProfilerMiddleware:
+    """Profile a single request on demand and write a collapsed-stack file named by correlation id.
+
+    Triggered by an ``X-Profile: 1`` header or a ``?profile=1`` query flag from a caller with
+    debug access. The sampler sees the whole event-loop thread, so concurrent requests share
+    the profile; use it against a quiet worker.
+    """
+
+    def __init__(self, app: ASGIApp, settings: AppSettings) -> None:
+        self.app = app
+        self.settings = settings
+        self.output_dir = Path(settings.profiling_dir)
+        self.interval = settings.profiling_interval_ms / 1000
+
+    def is_triggered(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if headers.get(PROFILE_HEADER_KEY) != "1" and QueryParams(scope["query_string"]).get(PROFILE_QUERY_KEY) != "1":
+            return False
+
+        return has_debug_access(headers.get(self.settings.debug_token_header_key), self.settings)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.is_triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        file_name = f"{correlation_id.get()}.collapsed"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(PROFILE_FILE_HEADER_KEY, file_name)
+            await send(message)
+
+        sampler = StackSampler(
+            thread_id=threading.get_ident(),
+            interval=self.interval,
+            output_path=self.output_dir / file_name,
+        )
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
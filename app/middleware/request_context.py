@@ -0,0 +1,47 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.deadline import DeadlinePolicy
+from app.utils.request_context import new_request_context, request_context
+
+logger = logging.getLogger(__name__)
+
+
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp, query_budget: int | None = None, deadlines: DeadlinePolicy | None = None) -> None:
+        self.app = app
+        self.query_budget = query_budget
+        self.deadlines = deadlines
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = new_request_context(scope, query_budget=self.query_budget)
+        timeout = self.deadlines.timeout(scope) if self.deadlines is not None else None
+        if timeout is not None:
+            context.deadline = context.started_at + timeout
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and context.response_headers:
+                headers = MutableHeaders(scope=message)
+                for name, value in context.response_headers:
+                    headers.append(name, value)
+            await send(message)
+
+        token = request_context.set(context)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_context.reset(token)
+            if context.query_count:
+                logger.debug(
+                    "route=%s queries=%d db_time=%.1fms total=%.1fms",
+                    context.route_name,
+                    context.query_count,
+                    context.query_time * 1000,
+                    context.elapsed * 1000,
+                )
@@ -0,0 +1,37 @@
+from collections.abc import Sequence
+from functools import lru_cache
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import Scope
+
+UNMATCHED_ROUTE = "unmatched"
+ROUTE_NAME_KEY = "app.route_name"
+
+
+class RouteNameResolver:
+    """Resolve the route name for a request before the router has run, e.g. ``users:all``.
+
+    ``create_app`` builds one and shares it between the middlewares; the name is kept in the
+    scope, so the routes are matched once per request however many middlewares ask.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._routes: Sequence[BaseRoute] | None = None
+        self._match = lru_cache(maxsize=maxsize)(self._match_route_name)
+
+    def __call__(self, scope: Scope) -> str:
+        if (name := scope.get(ROUTE_NAME_KEY)) is not None:
+            return name
+        if self._routes is None:
+            self._routes = scope["app"].router.routes
+        name = scope[ROUTE_NAME_KEY] = self._match(scope["method"], scope["path"])
+        return name
+
+    def _match_route_name(self, method: str, path: str) -> str:
+        scope = {"type": "http", "method": method, "path": path, "root_path": ""}
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return getattr(route, "name", None) or route.path
+
+        return UNMATCHED_ROUTE
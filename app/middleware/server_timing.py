@@ -0,0 +1,55 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.request_context import get_request_context
+
+PHASE_DESCRIPTIONS = {
+    "auth": "token decode and user lookup",
+    "db": "database",
+    "service": "service logic",
+    "hash": "password hashing",
+    "serialize": "response validation and encoding",
+}
+
+
+class ServerTimingMiddleware:
+    """Emit a ``Server-Timing`` header with the phases recorded for the request.
+
+    Each phase is exclusive of the others and of ``db``, e.g. ``service`` is the handler's own
+    time without the queries, hashing and serialization it runs, so only ``total`` overlaps.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        context = get_request_context() if scope["type"] == "http" else None
+        if context is None:
+            await self.app(scope, receive, send)
+            return
+
+        context.timings = {}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timings = dict(context.timings)
+                if context.query_count:
+                    timings["db"] = context.query_time
+                timings["total"] = context.elapsed
+
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", self.format_timings(timings))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def format_timings(timings: dict[str, float]) -> str:
+        metrics = []
+        for name, seconds in timings.items():
+            metric = f"{name};dur={seconds * 1000:.2f}"
+            if name in PHASE_DESCRIPTIONS:
+                metric += f';desc="{PHASE_DESCRIPTIONS[name]}"'
+            metrics.append(metric)
+
+        return ", ".join(metrics)
@@ -0,0 +1,80 @@
+from pathlib import Path
+from random import random
+
+from asgi_correlation_id import CorrelationIdMiddleware
+from asgi_correlation_id.context import correlation_id
+from fastapi import FastAPI
+from starlette.middleware import Middleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.settings.app import AppSettings
+from app.utils.tracing import ChromeTraceExporter, SpanRecorder, current_trace, start_trace
+
+
+class TracingMiddleware:
+    """Open the root span of a head-sampled request and export its trace when it finishes."""
+
+    def __init__(self, app: ASGIApp, exporter: ChromeTraceExporter, sample_rate: float) -> None:
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        trace = start_trace(correlation_id.get())
+        token = current_trace.set(trace)
+        try:
+            with SpanRecorder(f"http.{scope['method']}", path=scope["path"]) as root:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(token)
+            root.attributes["route"] = getattr(scope.get("route"), "name", None)
+            root.attributes["status"] = status_code
+            self.exporter.export(trace)
+
+
+class TracedMiddleware:
+    """Wrap another middleware so the time spent in it, and below it, shows up as a span."""
+
+    def __init__(self, app: ASGIApp, middleware: Middleware) -> None:
+        middleware_class, args, kwargs = middleware
+        self.app = middleware_class(app=app, *args, **kwargs)
+        self.span_name = f"middleware.{middleware_class.__name__}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        with SpanRecorder(self.span_name):
+            await self.app(scope, receive, send)
+
+
+def install_tracing(app: FastAPI, settings: AppSettings) -> None:
+    exporter = ChromeTraceExporter(
+        path=Path(settings.tracing_file),
+        max_bytes=settings.tracing_max_bytes,
+        backup_count=settings.tracing_backup_count,
+    )
+    root = Middleware(TracingMiddleware, exporter=exporter, sample_rate=settings.tracing_sample_rate)
+
+    user_middleware = []
+    for middleware in app.user_middleware:
+        if middleware.cls is CorrelationIdMiddleware:
+            user_middleware.extend([middleware, root])
+        else:
+            user_middleware.append(Middleware(TracedMiddleware, middleware=middleware))
+
+    if root not in user_middleware:
+        user_middleware.insert(0, root)
+
+    app.user_middleware = user_middleware
+    app.state.trace_exporter = exporter
+    app.add_event_handler("shutdown", exporter.close)
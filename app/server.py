@@ -0,0 +1,135 @@
+"""Production entry point, ``python -m app.server``.
+
+Runs the application under Hypercorn with one worker process per available CPU, capped so
+that every worker's connection pool fits in the database's connection limit. Workers are
+recycled after ``server_max_requests`` requests (with jitter) to bound memory growth, and a
+shutdown waits ``server_graceful_timeout`` for in-flight requests before the lifespan
+shutdown drains the pool within ``db_drain_timeout``.
+
+With several workers, metrics go through a ``PROMETHEUS_MULTIPROC_DIR`` that is emptied at
+start-up and shutdown; each worker's lifespan shutdown marks its process dead, so the live
+gauges of a recycled worker are dropped. Idempotency keys need ``idempotency_backend = "redis"``
+to be shared, otherwise a retry reaching another worker runs again.
+"""
+
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from hypercorn.config import Config
+from hypercorn.run import run
+
+from app.core import settings
+from app.core.settings.app import AppSettings
+
+logger = logging.getLogger(__name__)
+
+APPLICATION_PATH = "app.main:app"
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus() -> int:
+    """CPUs this process may actually use, honouring affinity masks and cgroup v2 quotas."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, int(quota) // int(period)))
+
+
+def autotune_workers(settings: AppSettings, cpus: int | None = None) -> int:
+    if settings.server_workers is not None:
+        return settings.server_workers
+
+    cpus = cpus if cpus is not None else available_cpus()
+    connections_per_worker = settings.db_pool_size + settings.db_max_overflow
+    workers = max(1, min(cpus, settings.db_max_connections // connections_per_worker))
+    if workers < cpus:
+        logger.warning(
+            "Running %d of %d possible workers: each needs %d database connections and the limit is %d.",
+            workers,
+            cpus,
+            connections_per_worker,
+            settings.db_max_connections,
+        )
+    return workers
+
+
+def build_config(settings: AppSettings, workers: int) -> Config:
+    config = Config()
+    config.application_path = APPLICATION_PATH
+    config.bind = [f"{settings.server_host}:{settings.server_port}"]
+    config.workers = workers
+    # uvloop is an optional speed-up; the stock asyncio loop is used when it isn't installed
+    config.worker_class = "uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio"
+    config.backlog = settings.server_backlog
+    config.keep_alive_timeout = settings.server_keep_alive_timeout
+    config.max_requests = settings.server_max_requests
+    config.max_requests_jitter = settings.server_max_requests_jitter
+    config.graceful_timeout = settings.server_graceful_timeout
+    config.shutdown_timeout = settings.db_drain_timeout + 1.0
+    # HTTP/2 is negotiated through ALPN when serving TLS, and through h2c upgrade otherwise
+    config.certfile = settings.server_certfile
+    config.keyfile = settings.server_keyfile
+    # log through the application's handlers, installed when each worker imports the app
+    config.accesslog = logging.getLogger("hypercorn.access")
+    config.errorlog = logging.getLogger("hypercorn.error")
+    return config
+
+
+def clear_metrics_dir(path: Path) -> None:
+    for metrics_file in path.glob("*.db"):
+        metrics_file.unlink(missing_ok=True)
+
+
+@contextmanager
+def multiprocess_metrics_dir(workers: int) -> Iterator[None]:
+    """Provide the directory workers write their metrics to, without files from earlier runs.
+
+    A directory configured through ``PROMETHEUS_MULTIPROC_DIR`` is emptied at start-up and
+    shutdown. Otherwise, with several workers, a temporary one is created and removed.
+    """
+    configured = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if configured is not None:
+        clear_metrics_dir(Path(configured))
+        try:
+            yield
+        finally:
+            clear_metrics_dir(Path(configured))
+        return
+
+    if workers <= 1:
+        yield
+        return
+
+    # workers are spawned, so they inherit this and write their metrics to the shared directory
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path = tempfile.mkdtemp(prefix="prometheus-")
+    try:
+        yield
+    finally:
+        del os.environ["PROMETHEUS_MULTIPROC_DIR"]
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def main() -> int:
+    workers = autotune_workers(settings)
+    config = build_config(settings, workers)
+    logger.info("Starting %d %s workers on %s.", workers, config.worker_class, ", ".join(config.bind))
+    if workers > 1 and settings.idempotency_enabled and settings.idempotency_backend == "memory":
+        logger.warning("Idempotency keys are kept per worker: a retry that reaches another worker runs again. Set IDEMPOTENCY_BACKEND=redis.")
+    with multiprocess_metrics_dir(workers):
+        return run(config)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.logging_level)
+    sys.exit(main())
@@ -1,7 +1,7 @@
 import logging
+from datetime import UTC, datetime
 
 from fastapi import Depends
-from fastapi.encoders import jsonable_encoder
 from starlette.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
@@ -22,9 +22,10 @@ from app.schemas.user import (
     UserOutData,
     UserResponse,
     UsersFilters,
+    UserTokenData,
 )
 from app.services.base import BaseService
-from app.utils import ServiceResult, response_4xx, return_service
+from app.utils import ServiceResult, response_4xx, return_service, serialize
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +48,7 @@ class UsersService(BaseService):
             status_code=HTTP_200_OK,
             content={
                 "message": constant.SUCCESS_MATCHED_USER_ID,
-                "data": jsonable_encoder(UserOutData.model_validate(user)),
+                "data": serialize(user, UserOutData),
             },
         )
 
@@ -66,7 +67,7 @@ class UsersService(BaseService):
             status_code=HTTP_200_OK,
             content={
                 "message": constant.SUCCESS_MATCHED_USER_TOKEN,
-                "data": jsonable_encoder(UserOutData.model_validate(token_user)),
+                "data": serialize(token_user, UserOutData),
             },
         )
 
@@ -88,7 +89,7 @@ class UsersService(BaseService):
             status_code=HTTP_200_OK,
             content={
                 "message": constant.SUCCESS_GET_USERS,
-                "data": jsonable_encoder([UserOutData.model_validate(user) for user in users]),
+                "data": serialize(users, UserOutData),
             },
         )
 
@@ -110,15 +111,11 @@ class UsersService(BaseService):
         created_user = await users_repo.signup_user(user_in=user_in)
         created_token = token.create_token_for_user(user=created_user, secret_key=secret_key)
 
-        user_data_with_auth = UserAuthOutData.model_validate(created_user)
-
-        user_data_with_auth.token = created_token
-
         return dict(
             status_code=HTTP_201_CREATED,
             content={
                 "message": constant.SUCCESS_SIGN_UP,
-                "data": jsonable_encoder(user_data_with_auth),
+                "data": serialize(created_user, UserAuthOutData, token=created_token),
             },
         )
 
@@ -151,15 +148,12 @@ class UsersService(BaseService):
             )
 
         created_token = token.create_token_for_user(user=searched_user, secret_key=secret_key)
-        user_data_with_auth = UserAuthOutData.model_validate(searched_user)
-
-        user_data_with_auth.token = created_token
 
         return dict(
             status_code=HTTP_200_OK,
             content={
                 "message": constant.SUCCESS_SIGN_IN,
-                "data": jsonable_encoder(user_data_with_auth),
+                "data": serialize(searched_user, UserAuthOutData, token=created_token),
             },
         )
 
@@ -176,7 +170,7 @@ class UsersService(BaseService):
             status_code=HTTP_200_OK,
             content={
                 "message": constant.SUCCESS_UPDATE_USER,
-                "data": jsonable_encoder(UserOutData.model_validate(updated_user)),
+                "data": serialize(updated_user, UserOutData),
             },
         )
 
@@ -192,6 +186,15 @@ class UsersService(BaseService):
             status_code=HTTP_200_OK,
             content={
                 "message": constant.SUCCESS_DELETE_USER,
-                "data": jsonable_encoder(deleted_user),
+                "data": serialize(deleted_user),
             },
         )
+
+
+def warm_up_serializers() -> None:
+    """Serialize a sample user once, so the first responses don't pay for mapper configuration and first-use encoder setup."""
+    now = datetime.now(UTC)
+    sample = User(id=0, username="warmup", email="warmup@example.com", created_at=now, updated_at=now)
+    token = UserTokenData(access_token="", token_type="")
+    for data in (serialize(sample, UserOutData), serialize([sample], UserOutData), serialize(sample, UserAuthOutData, token=token)):
+        ServiceResult(dict(status_code=HTTP_200_OK, content={"message": "", "data": data}))
@@ -11,4 +11,4 @@ from .request_exceptions import (
     http_exception_handler,
     request_validation_exception_handler,
 )
-from .service_result import ServiceResult, handle_result, return_service
+from .service_result import ServiceResult, handle_result, return_service, serialize
@@ -0,0 +1,89 @@
+import asyncio
+from collections import deque
+from time import perf_counter
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    """Concurrency limit with a CoDel-style bound on how long a request may queue for a slot.
+
+    At most ``limit`` requests run at once and at most ``max_queue`` wait. While the queue
+    drains regularly, a waiter may queue for up to ``interval`` seconds, which absorbs short
+    bursts. Once the queue has not been empty for a whole ``interval``, the backend is not
+    keeping up and the allowed wait drops to ``target`` seconds, so excess requests are shed
+    quickly instead of all of them timing out slowly.
+    """
+
+    def __init__(self, limit: int, max_queue: int, target: float, interval: float) -> None:
+        self.limit = limit
+        self.max_queue = max_queue
+        self.target = target
+        self.interval = interval
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_empty = perf_counter()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def overloaded(self) -> bool:
+        return bool(self._waiters) and perf_counter() - self._last_empty > self.interval
+
+    async def acquire(self) -> float:
+        """Wait for a slot and return the time spent queueing, or raise ``Overloaded``."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._last_empty = perf_counter()
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            raise Overloaded("queue_full")
+
+        timeout = self.target if self.overloaded else self.interval
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        queued_at = perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            if not waiter.done() or waiter.cancelled():
+                raise Overloaded("queue_timeout") from None
+            # the slot was handed over in the same iteration the deadline fired, so it is ours
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just as the client went away
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                self._discard(waiter)
+        return perf_counter() - queued_at
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # the slot passes straight to the next waiter, so ``active`` stays the same
+                waiter.set_result(None)
+                self._mark_if_empty()
+                return
+        self.active -= 1
+        self._last_empty = perf_counter()
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._mark_if_empty()
+
+    def _mark_if_empty(self) -> None:
+        if not self._waiters:
+            self._last_empty = perf_counter()
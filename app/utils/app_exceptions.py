@@ -65,8 +65,11 @@ class AppException:
         Response5XX
         """
 
-        def __init__(self, context: dict = None):
-            status_code = 500
+        def __init__(
+            self,
+            status_code: status = status.HTTP_500_INTERNAL_SERVER_ERROR,
+            context: dict = None,
+        ):
             AppExceptionCase.__init__(self, status_code, context)
 
 
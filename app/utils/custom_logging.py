@@ -1,11 +1,23 @@
+import atexit
 import json
 import logging
+import queue
 import sys
+import threading
+import traceback
+from collections.abc import Mapping
 from pathlib import Path
+from random import random
+from typing import Any, TextIO
 
 from asgi_correlation_id.context import correlation_id
 from loguru import logger
 
+from app.utils.metrics import LOG_QUEUE_DEPTH, LOG_RECORDS_DROPPED
+
+ACCESS_LOGGERS = ("uvicorn.access", "hypercorn.access")
+ERROR_LOGGERS = ("uvicorn.error", "hypercorn.error", "fastapi")
+
 
 class InterceptHandler(logging.Handler):
     loglevel_mapping = {
@@ -17,26 +29,138 @@ class InterceptHandler(logging.Handler):
         0: "NOTSET",
     }
 
+    def __init__(self, caller_info: bool = True) -> None:
+        super().__init__()
+        self.caller_info = caller_info
+
     def emit(self, record):
         try:
             level = logger.level(record.levelname).name
         except AttributeError:
             level = self.loglevel_mapping[record.levelno]
 
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
+        depth = 2
+        if self.caller_info:
+            frame = logging.currentframe()
+            while frame.f_code.co_filename == logging.__file__:
+                frame = frame.f_back
+                depth += 1
 
-        log = logger.bind(request_id="app")
+        log = logger.bind(request_id="app", logger_name=record.name)
         log.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
 
+class SampledAccessLogFilter(logging.Filter):
+    """Keep a ``sample_rate`` fraction of uvicorn and hypercorn access log lines, plus every 5xx."""
+
+    def __init__(self, sample_rate: float) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.sample_rate >= 1.0 or random() < self.sample_rate:
+            return True
+
+        args = record.args
+        if isinstance(args, Mapping):
+            # hypercorn passes its access log atoms, with the status code as a string
+            return str(args.get("s", "")).isdigit() and int(args["s"]) >= 500
+        return isinstance(args, tuple) and len(args) == 5 and isinstance(args[4], int) and args[4] >= 500
+
+
+class BatchedLogWriter:
+    """Bounded queue of formatted lines drained in batches by a single background thread.
+
+    Producers never block: when the queue is full the line is dropped and counted.
+    """
+
+    def __init__(self, stream: TextIO, queue_size: int, batch_size: int) -> None:
+        self.stream = stream
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def write(self, line: str) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def stats(self) -> dict[str, int]:
+        return {"queue_depth": self.queue_depth, "dropped": self.dropped, "written": self.written}
+
+    def _run(self) -> None:
+        closed = False
+        while not closed:
+            lines = [self._queue.get()]
+            while len(lines) < self.batch_size:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in lines:
+                closed = True
+                lines = [line for line in lines if line is not None]
+
+            self.stream.write("".join(lines))
+            self.stream.flush()
+            self.written += len(lines)
+            LOG_QUEUE_DEPTH.set(self._queue.qsize())
+
+
+class JsonLogSink:
+    def __init__(self, writer: BatchedLogWriter, caller_info: bool) -> None:
+        self.writer = writer
+        self.caller_info = caller_info
+
+    def __call__(self, message) -> None:
+        record = message.record
+        entry: dict[str, Any] = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "message": record["message"],
+            "correlation_id": correlation_id.get(),
+            "logger": record["extra"].get("logger_name", record["name"]),
+        }
+        if self.caller_info:
+            entry["function"] = record["function"]
+            entry["line"] = record["line"]
+        if record["exception"] is not None:
+            exc_type, exc_value, exc_traceback = record["exception"]
+            entry["exception"] = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+
+        self.writer.write(json.dumps(entry, default=str) + "\n")
+
+
 class CustomizeLogger:
+    json_writer: BatchedLogWriter | None = None
+
     @classmethod
-    def make_logger(cls, config_path: Path):
+    def make_logger(cls, config_path: Path, **overrides: Any):
         config = cls.load_logging_config(config_path)
-        logging_config = config.get("logger")
+        logging_config = {**config.get("logger"), **{key: val for key, val in overrides.items() if val is not None}}
+
+        if logging_config.get("json"):
+            return cls.customize_json_logging(
+                level=logging_config.get("level"),
+                caller_info=logging_config.get("caller_info", True),
+                queue_size=logging_config.get("queue_size"),
+                batch_size=logging_config.get("batch_size"),
+                access_log_sample_rate=logging_config.get("access_log_sample_rate", 1.0),
+            )
 
         logger = cls.customize_logging(
             Path(logging_config.get("path")) / logging_config.get("filename"),
@@ -83,10 +207,46 @@ class CustomizeLogger:
             handlers=[InterceptHandler()],
             level=0,
         )
-        logging.getLogger("uvicorn.access").handlers = [InterceptHandler()]
-        for _log in ["uvicorn.error", "fastapi"]:
+        for _log in ACCESS_LOGGERS + ERROR_LOGGERS:
             _logger = logging.getLogger(_log)
             _logger.handlers = [InterceptHandler()]
+            _logger.propagate = False
+
+        return logger.bind(request_id="app", method=None)
+
+    @classmethod
+    def customize_json_logging(
+        cls,
+        level: str,
+        caller_info: bool,
+        queue_size: int,
+        batch_size: int,
+        access_log_sample_rate: float,
+    ):
+        """One JSON line per record, gated by level before formatting, written in batches off-thread."""
+        if cls.json_writer is None:
+            cls.json_writer = BatchedLogWriter(sys.stdout, queue_size=queue_size, batch_size=batch_size)
+            atexit.register(cls.json_writer.close)
+
+        logger.remove()
+        logger.add(
+            JsonLogSink(cls.json_writer, caller_info=caller_info),
+            level=level.upper(),
+            format="{message}",
+            backtrace=False,
+            diagnose=False,
+        )
+
+        levelno = logging.getLevelName(level.upper())
+        handler = InterceptHandler(caller_info=caller_info)
+        logging.basicConfig(handlers=[handler], level=levelno, force=True)
+
+        for _log in ACCESS_LOGGERS + ERROR_LOGGERS:
+            _logger = logging.getLogger(_log)
+            _logger.handlers = [handler]
+            _logger.propagate = False
+        for _log in ACCESS_LOGGERS:
+            logging.getLogger(_log).filters = [SampledAccessLogFilter(access_log_sample_rate)]
 
         return logger.bind(request_id="app", method=None)
 
@@ -0,0 +1,177 @@
+import asyncio
+import base64
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any
+
+from app.core.settings.app import AppSettings
+
+
+@dataclass(slots=True, frozen=True)
+class StoredResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+@dataclass(slots=True)
+class IdempotencyRecord:
+    fingerprint: str
+    expires_at: float
+    response: StoredResponse | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class IdempotencyBackend(ABC):
+    """Where first responses are kept by idempotency key, for ``ttl`` seconds after they were recorded."""
+
+    @abstractmethod
+    async def claim(self, key: str, fingerprint: str) -> tuple[IdempotencyRecord, bool]:
+        """Return the record under ``key`` and whether this call created it, and so must execute the request."""
+
+    @abstractmethod
+    async def wait(self, key: str, record: IdempotencyRecord) -> None:
+        """Wait until the execution that created ``record`` has completed."""
+
+    @abstractmethod
+    async def complete(self, key: str, record: IdempotencyRecord, response: StoredResponse | None) -> None:
+        """Store the response, or forget the key when ``response`` is ``None`` so a retry runs again."""
+
+
+class MemoryIdempotencyBackend(IdempotencyBackend):
+    """Store for a single process; a retry that reaches another worker executes again.
+
+    A record exists from the moment the first request starts, so a duplicate arriving while
+    it runs can wait on ``done`` instead of executing a second time.
+
+    Every record, finished or in flight, counts against ``max_keys``. Records are kept in
+    expiry order, which with a single ``ttl`` is the order they were begun or completed in,
+    so eviction pops expired records and then the soonest to expire from the front in O(1).
+    """
+
+    def __init__(self, ttl: float, max_keys: int = 10_000) -> None:
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._records: OrderedDict[str, IdempotencyRecord] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, key: str) -> IdempotencyRecord | None:
+        record = self._records.get(key)
+        if record is not None and record.response is not None and record.expires_at <= monotonic():
+            del self._records[key]
+            return None
+        return record
+
+    async def claim(self, key: str, fingerprint: str) -> tuple[IdempotencyRecord, bool]:
+        record = self.get(key)
+        if record is not None:
+            return record, False
+
+        if len(self._records) >= self.max_keys:
+            self._evict()
+        record = IdempotencyRecord(fingerprint=fingerprint, expires_at=monotonic() + self.ttl)
+        self._records[key] = record
+        return record, True
+
+    async def wait(self, key: str, record: IdempotencyRecord) -> None:
+        await record.done.wait()
+
+    async def complete(self, key: str, record: IdempotencyRecord, response: StoredResponse | None) -> None:
+        if response is not None:
+            record.response = response
+            record.expires_at = monotonic() + self.ttl
+            if self._records.get(key) is record:
+                self._records.move_to_end(key)
+        elif self._records.get(key) is record:
+            del self._records[key]
+        record.done.set()
+
+    def _evict(self) -> None:
+        now = monotonic()
+        while self._records and next(iter(self._records.values())).expires_at <= now:
+            self._records.popitem(last=False)
+        # still full of live keys: the soonest to expire go first
+        while len(self._records) >= self.max_keys:
+            self._records.popitem(last=False)
+
+
+class RedisIdempotencyBackend(IdempotencyBackend):
+    """Store shared by every worker and instance, for a ``redis.asyncio`` compatible client.
+
+    The first request claims the key with ``SET NX``; the record it leaves expires after
+    ``pending_ttl`` seconds, so a worker that dies mid-request doesn't block the key for good.
+    Duplicates poll every ``poll_interval`` seconds until the response is stored.
+    """
+
+    def __init__(self, client: Any, ttl: float, pending_ttl: float, prefix: str = "idempotency:", poll_interval: float = 0.05) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self.prefix = prefix
+        self.poll_interval = poll_interval
+
+    async def claim(self, key: str, fingerprint: str) -> tuple[IdempotencyRecord, bool]:
+        pending = json.dumps({"fingerprint": fingerprint})
+        while True:
+            if await self.client.set(self.prefix + key, pending, nx=True, px=_milliseconds(self.pending_ttl)):
+                return IdempotencyRecord(fingerprint=fingerprint, expires_at=monotonic() + self.pending_ttl), True
+            record = await self._get(key)
+            if record is not None:
+                return record, False
+            # the record expired between the two calls, so the key is free again
+
+    async def wait(self, key: str, record: IdempotencyRecord) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await self._get(key)
+            if current is None or current.response is not None:
+                return
+
+    async def complete(self, key: str, record: IdempotencyRecord, response: StoredResponse | None) -> None:
+        if response is None:
+            await self.client.delete(self.prefix + key)
+            return
+
+        stored = {
+            "fingerprint": record.fingerprint,
+            "status": response.status,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in response.headers],
+            "body": base64.b64encode(response.body).decode("ascii"),
+        }
+        await self.client.set(self.prefix + key, json.dumps(stored), px=_milliseconds(self.ttl))
+
+    async def _get(self, key: str) -> IdempotencyRecord | None:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+
+        stored = json.loads(raw)
+        response = None
+        if "status" in stored:
+            response = StoredResponse(
+                status=stored["status"],
+                headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored["headers"]],
+                body=base64.b64decode(stored["body"]),
+            )
+        return IdempotencyRecord(fingerprint=stored["fingerprint"], expires_at=monotonic(), response=response)
+
+
+def _milliseconds(seconds: float) -> int:
+    return max(int(seconds * 1000), 1)
+
+
+def create_idempotency_backend(settings: AppSettings, ttl: float) -> IdempotencyBackend:
+    if settings.idempotency_backend == "redis":
+        try:
+            from redis import asyncio as redis
+        except ImportError as import_error:
+            raise RuntimeError("idempotency_backend 'redis' requires the redis extra: poetry install --extras redis") from import_error
+
+        return RedisIdempotencyBackend(redis.from_url(settings.idempotency_redis_url), ttl=ttl, pending_ttl=settings.idempotency_pending_ttl_s)
+
+    return MemoryIdempotencyBackend(ttl=ttl, max_keys=settings.idempotency_max_keys)
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from time import perf_counter
+
+from asgi_correlation_id.context import correlation_id
+
+from app.utils.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """Measure event-loop scheduling lag and report what is blocking the loop.
+
+    A task sleeps for ``interval`` seconds and records how late it wakes up. A watchdog
+    thread checks that the task keeps beating; once the loop has been stuck for more than
+    ``block_threshold`` seconds it captures the loop thread's stack and logs it, together
+    with the correlation id of the task that was running.
+    """
+
+    def __init__(self, interval: float, block_threshold: float) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.stalls = 0
+        self.last_stack: str | None = None
+        self._heartbeat = perf_counter()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._stopped = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = perf_counter()
+        self._task = self._loop.create_task(self._measure_lag())
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _measure_lag(self) -> None:
+        while True:
+            scheduled_at = perf_counter()
+            await asyncio.sleep(self.interval)
+            self._heartbeat = now = perf_counter()
+            EVENT_LOOP_LAG.observe(max(now - scheduled_at - self.interval, 0.0))
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stopped.wait(self.interval):
+            heartbeat = self._heartbeat
+            blocked_for = perf_counter() - heartbeat - self.interval
+            if blocked_for < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+
+            reported_heartbeat = heartbeat
+            self.stalls += 1
+            EVENT_LOOP_STALLS.inc()
+            self._report_stall(blocked_for)
+
+    def _report_stall(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        self.last_stack = "".join(traceback.format_stack(frame)) if frame is not None else None
+
+        request_id = None
+        task = asyncio.current_task(self._loop)
+        if task is not None:
+            request_id = task.get_context().get(correlation_id)
+
+        logger.warning(
+            "Event loop blocked for %.0fms correlation_id=%s\n%s",
+            blocked_for * 1000,
+            request_id,
+            self.last_stack,
+        )
@@ -0,0 +1,72 @@
+import gc
+import itertools
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any
+
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryDiagnostics:
+    """tracemalloc snapshots kept in-process, so leaks can be diffed on a live worker."""
+
+    def __init__(self, max_snapshots: int = 10) -> None:
+        self.max_snapshots = max_snapshots
+        self.snapshots: OrderedDict[int, tracemalloc.Snapshot] = OrderedDict()
+        self._snapshot_ids = itertools.count(1)
+
+    @property
+    def is_tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self.snapshots.clear()
+
+    def traced_memory(self) -> dict[str, int]:
+        current, peak = tracemalloc.get_traced_memory()
+        return {"current": current, "peak": peak}
+
+    def take_snapshot(self) -> int:
+        snapshot_id = next(self._snapshot_ids)
+        self.snapshots[snapshot_id] = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+
+        return snapshot_id
+
+    def compare(self, first: int, second: int, group_by: str = "lineno", limit: int = 20) -> list[dict[str, Any]]:
+        """Top allocation differences from snapshot ``first`` to snapshot ``second``."""
+        stats = self.snapshots[second].compare_to(self.snapshots[first], group_by)
+        return [
+            {
+                "location": str(stat.traceback[0]) if group_by != "filename" else stat.traceback[0].filename,
+                "size": stat.size,
+                "size_diff": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ]
+
+    @staticmethod
+    def gc_stats(limit: int = 20) -> dict[str, Any]:
+        object_counts = Counter(type(obj).__qualname__ for obj in gc.get_objects())
+        return {
+            "generations": gc.get_stats(),
+            "counts": gc.get_count(),
+            "thresholds": gc.get_threshold(),
+            "objects": dict(object_counts.most_common(limit)),
+        }
+
+
+memory_diagnostics = MemoryDiagnostics()
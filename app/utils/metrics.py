@@ -0,0 +1,116 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05)
+BCRYPT_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route name.",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served by route name.",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "app_admission_wait_seconds",
+    "Time requests queued for a concurrency slot by budget.",
+    ["budget"],
+    buckets=FAST_BUCKETS + (0.1, 0.25, 0.5, 1.0),
+)
+REQUESTS_SHED = Counter(
+    "app_requests_shed",
+    "Requests rejected with 503 by load shedding, by route name and reason.",
+    ["route", "reason"],
+)
+REQUESTS_RATE_LIMITED = Counter(
+    "app_requests_rate_limited",
+    "Requests rejected with 429 by the auth rate limiter, by the key that was exhausted.",
+    ["scope"],
+)
+REQUESTS_REPLAYED = Counter(
+    "app_requests_replayed",
+    "Retried requests answered with the stored response for their idempotency key, by route name.",
+    ["route"],
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "app_response_cache_lookups",
+    "Response cache lookups by cache and result: hit, stale, shared or miss.",
+    ["cache", "result"],
+)
+DB_TIME = Histogram(
+    "app_db_seconds",
+    "Database time spent per request by route name.",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "app_db_queries",
+    "Database statements executed per request by route name.",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+BCRYPT_TIME = Histogram(
+    "app_bcrypt_seconds",
+    "Time spent hashing or verifying passwords with bcrypt.",
+    ["operation"],
+    buckets=BCRYPT_BUCKETS,
+)
+JWT_DECODE_TIME = Histogram(
+    "app_jwt_decode_seconds",
+    "Time spent decoding and validating JWT access tokens.",
+    buckets=FAST_BUCKETS,
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "app_event_loop_lag_seconds",
+    "How late the event loop wakes up a sleeping task.",
+    buckets=FAST_BUCKETS + (0.1, 0.25, 0.5, 1.0),
+)
+EVENT_LOOP_STALLS = Counter(
+    "app_event_loop_stalls",
+    "Times the event loop was blocked past the configured threshold.",
+)
+
+LOG_QUEUE_DEPTH = Gauge(
+    "app_log_queue_depth",
+    "Formatted log lines waiting for the background writer.",
+    multiprocess_mode="livesum",
+)
+LOG_RECORDS_DROPPED = Counter(
+    "app_log_records_dropped",
+    "Log records dropped because the writer queue was full.",
+)
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauge files, so in-flight counts of a recycled worker stop being reported."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render the exposition text, merging every worker's files when running multi-process."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,49 @@
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+
+class StackSampler:
+    """Sample the stack of one thread at a fixed interval and write it as collapsed stacks.
+
+    The output has one ``frame;frame;frame count`` line per distinct stack, the folded format
+    read by flamegraph.pl and speedscope. Everything, including the final write, happens on the
+    sampler thread, so the profiled event loop is only slowed down by the sampling itself.
+    """
+
+    def __init__(self, thread_id: int, interval: float, output_path: Path) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.output_path = output_path
+        self.samples: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[self._collapse(frame)] += 1
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.output_path, "w") as output_file:
+            for stack, count in self.samples.most_common():
+                output_file.write(f"{stack} {count}\n")
+
+    @staticmethod
+    def _collapse(frame: FrameType | None) -> str:
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+
+        return ";".join(reversed(frames))
@@ -0,0 +1,124 @@
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+from app.core.settings.app import AppSettings
+
+# GCRA, the same algorithm as ``gcra_step``, evaluated atomically on the server with its clock
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local interval = window / limit
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now)
+local new_tat = tat + interval
+if new_tat - now > window then
+    return {0, tostring(new_tat - now - window), tostring(tat - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0', tostring(new_tat - now)}
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class RateLimit:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    @classmethod
+    def from_gcra(cls, allowed: bool, limit: int, window: float, retry_after: float, reset_after: float) -> "RateLimit":
+        # the epsilon keeps float error in the timestamps from costing a whole token
+        remaining = math.floor((window - reset_after) / (window / limit) + 1e-6) if allowed else 0
+        return cls(allowed=allowed, limit=limit, remaining=max(remaining, 0), reset_after=reset_after, retry_after=retry_after)
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+def gcra_step(tat: float | None, now: float, limit: int, window: float) -> tuple[bool, float, float, float]:
+    """One step of the generic cell rate algorithm, a token bucket kept as a single timestamp.
+
+    ``tat`` is the theoretical arrival time stored for the key. Returns whether the hit is
+    allowed, the timestamp to store, the seconds until a retry can succeed and the seconds
+    until the bucket is full again.
+    """
+    tat = max(tat if tat is not None else now, now)
+    new_tat = tat + window / limit
+    if new_tat - now > window:
+        return False, tat, new_tat - now - window, tat - now
+    return True, new_tat, 0.0, new_tat - now
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> RateLimit: ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process store; each worker enforces its own share of the limit.
+
+    Keys are kept in least recently hit order and at most ``max_keys`` of them. A hit on a
+    full store first drops refilled buckets from the front, then the least recently hit
+    key, so every hit stays O(1) however many keys a burst sprays.
+    """
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = monotonic) -> None:
+        self.max_keys = max_keys
+        self.clock = clock
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimit:
+        now = self.clock()
+        tat = self._tats.pop(key, None)
+        if len(self._tats) >= self.max_keys:
+            self._evict(now)
+
+        allowed, tat, retry_after, reset_after = gcra_step(tat, now, limit, window)
+        self._tats[key] = tat
+        return RateLimit.from_gcra(allowed, limit, window, retry_after, reset_after)
+
+    def _evict(self, now: float) -> None:
+        # keys whose bucket has refilled carry no state worth keeping
+        while self._tats and next(iter(self._tats.values())) <= now:
+            self._tats.popitem(last=False)
+        while len(self._tats) >= self.max_keys:
+            self._tats.popitem(last=False)
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Store shared by every worker and instance, for a ``redis.asyncio`` compatible client."""
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimit:
+        allowed, retry_after, reset_after = await self.client.eval(GCRA_SCRIPT, 1, self.prefix + key, limit, window)
+        return RateLimit.from_gcra(bool(int(allowed)), limit, window, float(retry_after), float(reset_after))
+
+
+def create_rate_limit_backend(settings: AppSettings) -> RateLimitBackend:
+    if settings.rate_limit_backend == "redis":
+        try:
+            from redis import asyncio as redis
+        except ImportError as import_error:
+            raise RuntimeError("rate_limit_backend 'redis' requires the redis extra: poetry install --extras redis") from import_error
+
+        return RedisRateLimitBackend(redis.from_url(settings.rate_limit_redis_url))
+
+    return MemoryRateLimitBackend()
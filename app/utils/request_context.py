@@ -0,0 +1,104 @@
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from time import perf_counter
+from typing import Any
+
+from asgi_correlation_id.context import correlation_id
+
+
+@dataclass(slots=True)
+class RequestContext:
+    scope: dict[str, Any]
+    correlation_id: str | None = None
+    started_at: float = field(default_factory=perf_counter)
+    query_budget: int | None = None
+    query_count: int = 0
+    query_time: float = 0.0
+    timings: dict[str, float] | None = None
+    # time already attributed to a phase, so an enclosing phase can leave it out
+    phase_time: float = 0.0
+    response_headers: list[tuple[str, str]] | None = None
+    deadline: float | None = None
+
+    @property
+    def route_name(self) -> str | None:
+        route = self.scope.get("route")
+        return getattr(route, "name", None)
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.started_at
+
+    def remaining(self) -> float | None:
+        """Seconds left before the request's deadline, or ``None`` when it has none."""
+        return self.deadline - perf_counter() if self.deadline is not None else None
+
+
+request_context: ContextVar[RequestContext | None] = ContextVar("request_context", default=None)
+
+
+def get_request_context() -> RequestContext | None:
+    return request_context.get()
+
+
+def new_request_context(scope: dict[str, Any], **kwargs: Any) -> RequestContext:
+    return RequestContext(scope=scope, correlation_id=correlation_id.get(), **kwargs)
+
+
+def add_response_header(name: str, value: str) -> None:
+    """Attach a header to the response of the current request, whichever handler produces it."""
+    context = request_context.get()
+    if context is not None:
+        if context.response_headers is None:
+            context.response_headers = []
+        context.response_headers.append((name, value))
+
+
+def record_timing(name: str, seconds: float) -> None:
+    context = request_context.get()
+    if context is not None and context.timings is not None:
+        context.timings[name] = context.timings.get(name, 0.0) + seconds
+        context.phase_time += seconds
+
+
+class PhaseTimer:
+    """Accumulate the time spent in a block under ``name`` when the request collects timings.
+
+    Phases are exclusive: the time of phases nested in the block and of its database queries
+    is left out, so the recorded phases and ``db`` never add up to more than the request.
+    """
+
+    __slots__ = ("name", "context", "started_at", "phase_time", "query_time")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        context = request_context.get()
+        self.context = context if context is not None and context.timings is not None else None
+        if self.context is not None:
+            self.phase_time = self.context.phase_time
+            self.query_time = self.context.query_time
+            self.started_at = perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.context is not None:
+            context = self.context
+            nested = context.phase_time - self.phase_time + context.query_time - self.query_time
+            elapsed = max(perf_counter() - self.started_at - nested, 0.0)
+            context.timings[self.name] = context.timings.get(self.name, 0.0) + elapsed
+            context.phase_time += elapsed
+
+
+def timed_phase(name: str) -> Callable[[Callable[..., Awaitable]], Callable[..., Awaitable]]:
+    def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with PhaseTimer(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
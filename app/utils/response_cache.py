@@ -0,0 +1,118 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from time import monotonic
+
+from fastapi.responses import Response
+
+from app.utils.metrics import RESPONSE_CACHE_LOOKUPS
+
+
+@dataclass(slots=True, frozen=True)
+class CachedResponse:
+    body: bytes
+    status_code: int
+    media_type: str | None
+    generation: int
+    fresh_until: float
+    stale_until: float
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, status_code=self.status_code, media_type=self.media_type)
+
+
+class ResponseCache:
+    """LRU cache of encoded responses, bounded by entry count and total body bytes.
+
+    ``invalidate`` bumps a generation counter instead of walking the entries: anything
+    stored under an older generation is a miss from then on and ages out of the LRU. An
+    entry older than ``ttl`` is still served for up to ``stale_ttl`` more seconds while the
+    one request that found it expired reloads it, and concurrent misses on a key wait for a
+    single load. Only 200 responses are stored; ``max_entries=0`` turns caching off.
+
+    Invalidation is per process, so with several workers a write is seen by the others once
+    their copy expires.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float, max_entries: int, max_bytes: int) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.size = 0
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self) -> None:
+        self.generation += 1
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[Response]]) -> Response:
+        if self.max_entries <= 0:
+            return await load()
+
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None and entry.generation == self.generation:
+                now = monotonic()
+                if now < entry.fresh_until:
+                    self._entries.move_to_end(key)
+                    RESPONSE_CACHE_LOOKUPS.labels(self.name, "hit").inc()
+                    return entry.to_response()
+                if now < entry.stale_until and key in self._loading:
+                    RESPONSE_CACHE_LOOKUPS.labels(self.name, "stale").inc()
+                    return entry.to_response()
+
+            loading = self._loading.get(key)
+            if loading is None:
+                break
+            # a load is in flight and nothing usable is cached: share its result, or retry if it failed
+            loaded = await asyncio.shield(loading)
+            if loaded is not None:
+                RESPONSE_CACHE_LOOKUPS.labels(self.name, "shared").inc()
+                return loaded.to_response()
+
+        RESPONSE_CACHE_LOOKUPS.labels(self.name, "miss").inc()
+        return await self._load(key, load)
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Response]]) -> Response:
+        loading = self._loading[key] = asyncio.get_running_loop().create_future()
+        generation = self.generation
+        loaded = None
+        try:
+            response = await load()
+            if response.status_code == 200:
+                now = monotonic()
+                loaded = CachedResponse(
+                    body=response.body,
+                    status_code=response.status_code,
+                    media_type=response.media_type,
+                    generation=generation,
+                    fresh_until=now + self.ttl,
+                    stale_until=now + self.ttl + self.stale_ttl,
+                )
+                # a write that landed during the load may not be in it, so it isn't kept
+                if generation == self.generation:
+                    self._store(key, loaded)
+            return response
+        finally:
+            del self._loading[key]
+            loading.set_result(loaded)
+
+    def _store(self, key: Hashable, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous.body)
+        self._entries[key] = entry
+        self.size += len(entry.body)
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.body)
@@ -1,9 +1,14 @@
-import inspect
+import sys
+from typing import Any
 
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from loguru import logger
+from pydantic import BaseModel
 
 from app.utils import AppExceptionCase
+from app.utils.request_context import PhaseTimer
+from app.utils.tracing import SpanRecorder
 
 
 class ServiceResult:
@@ -37,8 +42,8 @@ class ServiceResult:
 
 
 def caller_info() -> str:
-    info = inspect.getframeinfo(inspect.stack()[2][0])
-    return f"{info.filename}:{info.function}:{info.lineno}"
+    frame = sys._getframe(2)
+    return f"{frame.f_code.co_filename}:{frame.f_code.co_name}:{frame.f_lineno}"
 
 
 async def handle_result(result: ServiceResult):
@@ -50,10 +55,28 @@ async def handle_result(result: ServiceResult):
         return result
 
 
+def serialize(obj: Any, schema: type[BaseModel] | None = None, **fields: Any) -> Any:
+    """Validate ``obj``, or each item of a list, into ``schema`` and encode it for JSON, timed as the "serialize" phase."""
+    with PhaseTimer("serialize"):
+        if schema is not None:
+            if isinstance(obj, list):
+                obj = [schema.model_validate(item) for item in obj]
+            else:
+                obj = schema.model_validate(obj)
+                for name, value in fields.items():
+                    setattr(obj, name, value)
+        return jsonable_encoder(obj)
+
+
 def return_service(service_func) -> ServiceResult:
+    span_name = f"service.{service_func.__qualname__}"
+
     async def wrapper(*args, **kwargs):
-        sf = await service_func(*args, **kwargs)
+        with PhaseTimer("service"), SpanRecorder(span_name):
+            sf = await service_func(*args, **kwargs)
 
-        return ServiceResult(sf)
+        # rendering the JSON body counts towards the ``serialize`` the service started
+        with PhaseTimer("serialize"):
+            return ServiceResult(sf)
 
     return wrapper
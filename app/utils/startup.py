@@ -0,0 +1,57 @@
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Record how long each phase of application start-up takes.
+
+    Phases are kept in the order they ran. Once start-up is finished, the report is logged
+    and compared against ``budget`` seconds; a cold start over budget is logged as a warning
+    so the regression shows up before it turns into slow deploys and failed health checks.
+    """
+
+    def __init__(self, budget: float | None = None) -> None:
+        self.budget = budget
+        self.phases: dict[str, float] = {}
+        self.finished = False
+
+    def record(self, name: str, elapsed: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_at = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - started_at)
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.total > self.budget
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "phases": {name: round(elapsed * 1000, 3) for name, elapsed in self.phases.items()},
+            "total_ms": round(self.total * 1000, 3),
+            "budget_ms": round(self.budget * 1000, 3) if self.budget is not None else None,
+            "over_budget": self.over_budget,
+            "finished": self.finished,
+        }
+
+    def finish(self) -> None:
+        self.finished = True
+        phases = ", ".join(f"{name}={elapsed * 1000:.1f}ms" for name, elapsed in self.phases.items())
+        if self.over_budget:
+            logger.warning("Start-up took %.1fms, over the %.1fms budget: %s", self.total * 1000, self.budget * 1000, phases)
+        else:
+            logger.info("Start-up took %.1fms: %s", self.total * 1000, phases)
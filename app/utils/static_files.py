@@ -0,0 +1,133 @@
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+COMPRESSIBLE_MEDIA_TYPES = {"application/javascript", "application/json", "image/svg+xml", "text/javascript"}
+MIN_COMPRESS_SIZE = 256
+
+
+@dataclass(slots=True, frozen=True)
+class StaticAsset:
+    path: str
+    hashed_path: str
+    media_type: str
+    digest: str
+    body: bytes
+    gzipped: bytes | None
+
+
+def build_asset(path: str, body: bytes, media_type: str) -> StaticAsset:
+    digest = hashlib.sha256(body).hexdigest()[:12]
+
+    gzipped = None
+    if len(body) >= MIN_COMPRESS_SIZE and (media_type.startswith("text/") or media_type in COMPRESSIBLE_MEDIA_TYPES):
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(compressed) < len(body):
+            gzipped = compressed
+
+    posix_path = PurePosixPath(path)
+    hashed_path = str(posix_path.with_name(f"{posix_path.stem}.{digest}{posix_path.suffix}"))
+    return StaticAsset(path=path, hashed_path=hashed_path, media_type=media_type, digest=digest, body=body, gzipped=gzipped)
+
+
+@lru_cache(maxsize=256)
+def load_asset(file: Path, path: str, mtime_ns: int, size: int) -> StaticAsset:
+    # keyed on mtime and size so every app built in this process shares the work until the file changes
+    media_type = mimetypes.guess_type(file.name)[0] or "application/octet-stream"
+    return build_asset(path, file.read_bytes(), media_type)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether gzip is acceptable; an explicit ``gzip`` entry takes precedence over ``*``."""
+    qualities: dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        name = name.strip().lower()
+        if name not in ("gzip", "*"):
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def asset_response(asset: StaticAsset, request_headers: Headers, cache_control: str) -> Response:
+    """Respond with the variant of ``asset`` the client accepts, or 304 when its ETag still matches."""
+    body, etag = asset.body, f'"{asset.digest}"'
+    headers = {"Cache-Control": cache_control}
+    if asset.gzipped is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if accepts_gzip(request_headers.get("accept-encoding", "")):
+            body, etag = asset.gzipped, f'"{asset.digest}-gzip"'
+            headers["Content-Encoding"] = "gzip"
+    headers["ETag"] = etag
+
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None and (if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+
+    return Response(body, media_type=asset.media_type, headers=headers)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serve a directory from memory with content-hashed URLs and gzip variants.
+
+    Every file is also reachable as ``name.<hash>.ext``; those URLs never change content and
+    are cached as immutable, while the plain names are revalidated through their ETag.
+    ``url_path`` maps a plain name to its hashed URL for pages that link to the assets.
+    """
+
+    def __init__(self, *, directory: str | Path) -> None:
+        super().__init__(directory=directory)
+        self._assets: dict[str, tuple[StaticAsset, bool]] | None = None
+
+    @property
+    def assets(self) -> dict[str, tuple[StaticAsset, bool]]:
+        if self._assets is None:
+            self.build()
+        return self._assets
+
+    def build(self) -> None:
+        root = Path(self.directory)
+        assets = {}
+        for file in sorted(root.rglob("*")):
+            if not file.is_file():
+                continue
+            stat = file.stat()
+            asset = load_asset(file, file.relative_to(root).as_posix(), stat.st_mtime_ns, stat.st_size)
+            assets[asset.path] = (asset, False)
+            assets[asset.hashed_path] = (asset, True)
+        self._assets = assets
+
+    def url_path(self, path: str) -> str:
+        asset, _ = self.assets[path]
+        return asset.hashed_path
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+
+        asset, hashed = self.assets.get(Path(path).as_posix(), (None, False))
+        if asset is None:
+            raise HTTPException(status_code=404)
+
+        return asset_response(asset, Headers(scope=scope), IMMUTABLE_CACHE_CONTROL if hashed else REVALIDATE_CACHE_CONTROL)
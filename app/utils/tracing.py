@@ -0,0 +1,168 @@
+import inspect
+import itertools
+import json
+import os
+import queue
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from time import perf_counter, time
+from typing import Any
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    started_at: float
+    finished_at: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Trace:
+    correlation_id: str | None
+    track_id: int
+    wall_started_at: float = field(default_factory=time)
+    perf_started_at: float = field(default_factory=perf_counter)
+    spans: list[Span] = field(default_factory=list)
+
+    def to_chrome_events(self) -> list[dict[str, Any]]:
+        """Complete ("X") events of the Chrome trace event format, one track per request."""
+        pid = os.getpid()
+        origin_us = self.wall_started_at * 1_000_000
+        events = []
+        for span in self.spans:
+            if span.finished_at is None:
+                continue
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": round(origin_us + (span.started_at - self.perf_started_at) * 1_000_000, 1),
+                    "dur": round((span.finished_at - span.started_at) * 1_000_000, 1),
+                    "pid": pid,
+                    "tid": self.track_id,
+                    "args": {"correlation_id": self.correlation_id, **span.attributes},
+                }
+            )
+        return events
+
+
+current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+
+_track_ids = itertools.count(1)
+
+
+def start_trace(correlation_id: str | None) -> Trace:
+    return Trace(correlation_id=correlation_id, track_id=next(_track_ids))
+
+
+def record_span(name: str, started_at: float, finished_at: float, **attributes: Any) -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.spans.append(Span(name=name, started_at=started_at, finished_at=finished_at, attributes=attributes))
+
+
+class SpanRecorder:
+    """Record the enclosed block as a span of the current trace; a no-op for unsampled requests."""
+
+    __slots__ = ("name", "attributes", "current")
+
+    def __init__(self, name: str, **attributes: Any) -> None:
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span | None:
+        trace = current_trace.get()
+        if trace is None:
+            self.current = None
+            return None
+
+        self.current = Span(name=self.name, started_at=perf_counter(), attributes=self.attributes)
+        trace.spans.append(self.current)
+        return self.current
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: Any) -> None:
+        if self.current is not None:
+            self.current.finished_at = perf_counter()
+            if exc_type is not None:
+                self.current.attributes["error"] = exc_type.__name__
+
+
+def traced(name: str | None = None) -> Callable[[Callable], Callable]:
+    """Trace every call of the decorated function, sync or async, as a span."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with SpanRecorder(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with SpanRecorder(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ChromeTraceExporter:
+    """Append finished traces to a size-rotated file in the Chrome trace event JSON array format.
+
+    Writes happen on a background thread so exporting never blocks the event loop. The closing
+    bracket is omitted, which chrome://tracing, Perfetto and speedscope all accept.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, backup_count: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.SimpleQueue[list[dict[str, Any]] | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        self._queue.put(trace.to_chrome_events())
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while (events := self._queue.get()) is not None:
+            lines = "".join(json.dumps(event, default=str) + ",\n" for event in events)
+            self._write(lines)
+
+    def _write(self, lines: str) -> None:
+        if self.path.exists() and self.path.stat().st_size + len(lines) > self.max_bytes:
+            self._rotate()
+
+        is_new = not self.path.exists()
+        with open(self.path, "a") as trace_file:
+            if is_new:
+                trace_file.write("[\n")
+            trace_file.write(lines)
+
+    def _rotate(self) -> None:
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+
+        if self.backup_count > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
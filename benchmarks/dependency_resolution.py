@@ -0,0 +1,129 @@
+"""Measure how long FastAPI takes to resolve the dependencies of each API route.
+
+Every route's dependency graph is solved against a synthetic authenticated request,
+with the single database lookup of the auth dependency stubbed out, so the numbers
+reflect dependency-injection overhead rather than I/O. ``--ref`` first runs the same
+benchmark against another revision, checked out in a temporary git worktree, so a
+before/after comparison can be reproduced from one command.
+
+    python -m benchmarks.dependency_resolution --iterations 2000
+    python -m benchmarks.dependency_resolution --ref HEAD~1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from contextlib import AsyncExitStack
+from time import perf_counter
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import settings
+from app.core.token import create_token_for_user
+from app.database.repositories.users import UsersRepository
+from app.models.user import User
+
+USER = User(id=1, username="bench", email="bench@test.com")
+BODIES = {
+    "auth:signup": {"username": "bench", "password": "123", "email": "bench@test.com"},
+    "auth:signin": {"password": "123", "email": "bench@test.com"},
+    "user:patch-by-id": {"username": "bench"},
+}
+PATH_PARAMS = {"user:info-by-id": {"user_id": "1"}}
+
+
+def _request(app: FastAPI, route: APIRoute, token: str) -> Request:
+    scope = {
+        "type": "http",
+        "app": app,
+        "method": next(iter(route.methods)),
+        "path": route.path,
+        "query_string": b"skip=0&limit=10",
+        "headers": [(settings.auth_header_key.lower().encode(), f"{settings.jwt_token_prefix} {token}".encode())],
+        "path_params": PATH_PARAMS.get(route.name, {}),
+        "route": route,
+    }
+    body = json.dumps(BODIES[route.name]).encode() if route.name in BODIES else b""
+
+    # dependencies that read the body, like the auth rate limit, get it from here
+    async def receive() -> dict:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(scope, receive)
+
+
+async def resolve(app: FastAPI, route: APIRoute, token: str) -> float:
+    started_at = perf_counter()
+    async with AsyncExitStack() as stack:
+        _, errors, *_ = await solve_dependencies(
+            request=_request(app, route, token),
+            dependant=route.dependant,
+            body=BODIES.get(route.name),
+            dependency_overrides_provider=app,
+            async_exit_stack=stack,
+        )
+    elapsed = perf_counter() - started_at
+    assert not errors, errors
+    return elapsed
+
+
+async def run(iterations: int) -> None:
+    from app.main import create_app  # local import, building the app needs the settings of the environment
+
+    # thousands of sign-ins from one client would be rate limited within the warm-up;
+    # revisions from before the rate limit have no such setting
+    if hasattr(settings, "rate_limit_enabled"):
+        settings.rate_limit_enabled = False
+    app = create_app()
+    # sessions are opened but never used, so the engine never connects
+    app.state.pool = sessionmaker(bind=create_async_engine(str(settings.db_url)), class_=AsyncSession, expire_on_commit=False)
+    token = create_token_for_user(USER, settings.secret_key.get_secret_value()).access_token
+    routes = [route for route in app.routes if isinstance(route, APIRoute) and route.path.startswith(settings.api_v1_prefix) and "/debug" not in route.path]
+
+    print(f"{'route':<24}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}")
+    with mock.patch.object(UsersRepository, "get_user_by_email", mock.AsyncMock(return_value=USER)):
+        for route in routes:
+            for _ in range(iterations // 10):
+                await resolve(app, route, token)
+            timings = sorted([await resolve(app, route, token) for _ in range(iterations)])
+            p50, p99 = timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+            print(f"{route.name:<24}{statistics.fmean(timings) * 1e6:>10.1f}{p50 * 1e6:>10.1f}{p99 * 1e6:>10.1f}")
+
+
+def run_at(ref: str, iterations: int) -> None:
+    """Run this benchmark against the app as of ``ref``; the script itself stays the current one."""
+    with tempfile.TemporaryDirectory(prefix="dependency-resolution-") as worktree:
+        subprocess.run(["git", "worktree", "add", "--detach", worktree, ref], check=True, capture_output=True)
+        try:
+            print(f"at {ref}:")
+            # the script's own directory holds no ``app`` package, so ``app`` resolves to the worktree
+            env = {**os.environ, "PYTHONPATH": worktree}
+            subprocess.run([sys.executable, __file__, "--iterations", str(iterations)], cwd=worktree, env=env, check=True)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], check=True)
+    print("at the working tree:")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--ref", help="also run the benchmark against this git revision, first")
+    args = parser.parse_args()
+    if args.ref:
+        run_at(args.ref, args.iterations)
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Microbenchmarks of the CPU work every request pays for before any I/O, for pytest-benchmark.
+
+The module sits outside ``tests`` so the test suite never times anything; pass it to pytest
+explicitly. ``--benchmark-autosave`` keeps every run under ``.benchmarks/`` together with the
+commit it measured, and ``--benchmark-compare`` with ``--benchmark-compare-fail`` fails when a
+benchmark got slower than the last saved run.
+
+    pytest benchmarks/hot_paths.py --benchmark-autosave
+    pytest benchmarks/hot_paths.py -k token --benchmark-compare --benchmark-compare-fail=median:10%
+
+Only public helpers are timed. The coroutines never suspend, so they are driven with
+``send`` instead of an event loop, whose scheduling would dwarf what they cost.
+"""
+
+import inspect
+import os
+from collections.abc import Coroutine, Iterator
+from datetime import datetime
+from typing import Any
+
+import pytest
+from loguru import logger
+from starlette.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+
+from app.api.dependencies.auth import get_current_user_auth
+from app.core import constant, security, settings, token
+from app.models.user import User
+from app.schemas.user import UserOutData
+from app.utils import AppExceptionCase, ServiceResult, handle_result, response_4xx
+from app.utils.service_result import serialize
+
+SECRET_KEY = settings.secret_key.get_secret_value()
+USERS = [User(id=n, username=f"bench_{n}", email=f"bench_{n}@bench.test", created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 2)) for n in range(100)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def quiet_logger() -> Iterator[None]:
+    # handle_result logs every error; format the records as usual but drop the output
+    with open(os.devnull, "w") as devnull:
+        logger.remove()
+        handler_id = logger.add(devnull, level="DEBUG")
+        yield
+        logger.remove(handler_id)
+
+
+def run_to_completion(coroutine: Coroutine) -> Any:
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coroutine.close()
+    raise RuntimeError("the benchmarked coroutine suspended")
+
+
+def test_create_token_for_user(benchmark) -> None:
+    benchmark(token.create_token_for_user, USERS[0], SECRET_KEY)
+
+
+def test_get_user_from_token(benchmark) -> None:
+    access_token = token.create_token_for_user(USERS[0], SECRET_KEY).access_token
+
+    benchmark(token.get_user_from_token, access_token, SECRET_KEY)
+
+
+def test_get_password_hash(benchmark) -> None:
+    salt = security.generate_salt()
+
+    benchmark(security.get_password_hash, salt + "benchmark")
+
+
+def test_verify_password(benchmark) -> None:
+    salt = security.generate_salt()
+    hashed_password = security.get_password_hash(salt + "benchmark")
+
+    benchmark(security.verify_password, salt + "benchmark", hashed_password)
+
+
+@pytest.mark.parametrize("rows", [1, 100])
+def test_serialize_users(benchmark, rows: int) -> None:
+    benchmark(serialize, USERS[:rows], UserOutData)
+
+
+def test_service_result_success(benchmark) -> None:
+    content = {"message": constant.SUCCESS_GET_USERS, "data": serialize(USERS[:10], UserOutData)}
+
+    benchmark(lambda: ServiceResult(dict(status_code=HTTP_200_OK, content=content)))
+
+
+def test_handle_result_error(benchmark) -> None:
+    async def operation() -> None:
+        result = ServiceResult(response_4xx(status_code=HTTP_404_NOT_FOUND, context={"reason": constant.FAIL_VALIDATION_MATCHED_USER_ID}))
+        try:
+            await handle_result(result)
+        except AppExceptionCase:
+            pass
+
+    benchmark(lambda: run_to_completion(operation()))
+
+
+class _UsersByEmail:
+    """Answers the auth dependency's single lookup from memory, so only its CPU cost is timed."""
+
+    async def get_user_by_email(self, *, email: str) -> User:
+        return USERS[0]
+
+
+# "instrumented" is the dependency as routes run it, with its span and "auth" phase timing;
+# "unwrapped" is the same function without them, so the difference is what they cost
+@pytest.mark.parametrize("variant", ["instrumented", "unwrapped"])
+def test_current_user(benchmark, variant: str) -> None:
+    get_current_user = get_current_user_auth()
+    if variant == "unwrapped":
+        get_current_user = inspect.unwrap(get_current_user)
+    access_token = token.create_token_for_user(USERS[0], SECRET_KEY).access_token
+    users_repo = _UsersByEmail()
+
+    user = benchmark(lambda: run_to_completion(get_current_user(users_repo=users_repo, token=access_token, settings=settings)))
+
+    assert user is USERS[0]
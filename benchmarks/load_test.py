@@ -0,0 +1,261 @@
+"""Drive a weighted mix of API calls against the app and report latency per route.
+
+Virtual users sign in as users seeded by ``benchmarks.seed`` and then loop over the mix
+(signup, signin, info, list, patch) until ``--duration`` runs out. The app runs in process
+through ``ASGITransport`` by default, or is reached over HTTP with ``--url``; a server under
+test should run with ``RATE_LIMIT_ENABLED=false``, like the in-process app does, or the
+auth routes are rate limited within seconds. With ``USERS_REPOSITORY=memory`` the in-process
+app keeps users in memory and is seeded on start, which leaves Postgres out of the numbers.
+The ``load_*`` users the signups create are deleted from Postgres when the run ends.
+
+Results are printed per route name and can be saved with ``--output``; ``--baseline``
+compares them to saved results and exits non-zero when a route regressed by more than
+``--tolerance``.
+
+    python -m benchmarks.seed --users 10000
+    python -m benchmarks.load_test --duration 30 --concurrency 32 --output results.json
+    USERS_REPOSITORY=memory python -m benchmarks.load_test --duration 30
+    python -m benchmarks.load_test --url http://localhost:8080 --baseline benchmarks/baselines/asgi.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import sys
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+
+import httpx
+from asgi_lifespan import LifespanManager
+from fastapi import FastAPI
+
+from app.core import settings
+from benchmarks.seed import DEFAULT_PREFIX, delete_users, seeded_user, seeded_users
+
+DEFAULT_MIX = {"users:all": 40, "auth:info": 25, "auth:signin": 15, "user:patch-by-id": 10, "auth:signup": 10}
+PERCENTILES = (50, 95, 99)
+# throughput may drop and latency percentiles may grow by ``tolerance`` before it is a regression
+COMPARED_METRICS = {"throughput": -1, "p50_ms": 1, "p95_ms": 1, "p99_ms": 1}
+
+
+@dataclass(slots=True)
+class VirtualUser:
+    credentials: dict[str, str]
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    recording: bool = True
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        self.latencies.setdefault(route, []).append(seconds)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))]
+
+
+def summarize(recorder: Recorder, duration: float) -> dict[str, dict[str, float]]:
+    summary = {}
+    everything = []
+    for route, latencies in sorted(recorder.latencies.items()):
+        everything.extend(latencies)
+        summary[route] = _summarize_latencies(latencies, recorder.errors.get(route, 0), duration)
+    if everything:
+        summary["total"] = _summarize_latencies(everything, sum(recorder.errors.values()), duration)
+    return summary
+
+
+def _summarize_latencies(latencies: list[float], errors: int, duration: float) -> dict[str, float]:
+    ordered = sorted(latencies)
+    summary = {"requests": len(ordered), "errors": errors, "throughput": round(len(ordered) / duration, 2)}
+    for q in PERCENTILES:
+        summary[f"p{q}_ms"] = round(percentile(ordered, q) * 1000, 3)
+    return summary
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float) -> list[str]:
+    """Return a line per metric that regressed beyond ``tolerance`` relative to ``baseline``."""
+    regressions = []
+    for route, expected in baseline.items():
+        actual = results.get(route)
+        if actual is None:
+            regressions.append(f"{route}: missing from the results")
+            continue
+        if actual["errors"] > expected.get("errors", 0):
+            regressions.append(f"{route}: {actual['errors']} errors, baseline {expected.get('errors', 0)}")
+        for metric, direction in COMPARED_METRICS.items():
+            if metric not in expected or not expected[metric]:
+                continue
+            change = (actual[metric] - expected[metric]) / expected[metric]
+            if change * direction > tolerance:
+                regressions.append(f"{route}: {metric} {actual[metric]} vs baseline {expected[metric]} ({change:+.0%})")
+    return regressions
+
+
+def build_scenarios(app: FastAPI, run_id: str) -> dict[str, Callable[[httpx.AsyncClient, VirtualUser], Awaitable[httpx.Response]]]:
+    counter = iter(range(sys.maxsize))
+
+    async def signup(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+        n = next(counter)
+        body = {"username": f"load_{run_id}_{n}", "email": f"load_{run_id}_{n}@bench.test", "password": "benchmark"}
+        return await client.post(app.url_path_for("auth:signup"), json=body)
+
+    async def signin(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+        return await client.post(app.url_path_for("auth:signin"), json=user.credentials)
+
+    async def info(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+        return await client.get(app.url_path_for("auth:info"), headers=user.headers)
+
+    async def list_users(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+        # dashboards mostly poll the first pages
+        params = {"skip": random.choice((0, 0, 0, 100, 200, random.randrange(0, 10_000, 100))), "limit": 100}
+        return await client.get(app.url_path_for("users:all"), params=params)
+
+    async def patch(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+        return await client.patch(app.url_path_for("user:patch-by-id"), json={"username": user.credentials["username"]}, headers=user.headers)
+
+    return {"auth:signup": signup, "auth:signin": signin, "auth:info": info, "users:all": list_users, "user:patch-by-id": patch}
+
+
+async def sign_in(client: httpx.AsyncClient, scenarios: dict[str, Callable], seeded: int, prefix: str) -> VirtualUser:
+    user = VirtualUser(credentials=seeded_user(prefix, random.randrange(seeded)))
+    while True:
+        response = await scenarios["auth:signin"](client, user)
+        if response.status_code not in (429, 503):
+            break
+        # the auth budget sheds a burst of sign-ins, come back when told to
+        await asyncio.sleep(float(response.headers.get("retry-after", 1)) * random.random())
+    response.raise_for_status()
+    user.headers = {settings.auth_header_key: f"{settings.jwt_token_prefix} {response.json()['data']['token']['access_token']}"}
+    return user
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    user: VirtualUser,
+    scenarios: dict[str, Callable],
+    mix: dict[str, int],
+    recorder: Recorder,
+    stop_at: float,
+) -> None:
+    routes, weights = list(mix), list(mix.values())
+    while perf_counter() < stop_at:
+        route = random.choices(routes, weights)[0]
+        started_at = perf_counter()
+        try:
+            response = await scenarios[route](client, user)
+            ok = response.is_success
+        except httpx.HTTPError:
+            ok = False
+        recorder.record(route, perf_counter() - started_at, ok)
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    from app.main import create_app  # local import, building the app needs the settings of the environment
+
+    # the auth rate limits would turn most of the load into 429s
+    settings.rate_limit_enabled = False
+    app = create_app()
+    run_id = uuid.uuid4().hex[:8]
+    scenarios = build_scenarios(app, run_id)
+    recorder = Recorder(recording=False)
+
+    async with AsyncExitStack() as stack:
+        if args.url or settings.users_repository == "sql":
+            stack.push_async_callback(_delete_signed_up_users, run_id)
+        if args.url:
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30.0)
+        else:
+            await stack.enter_async_context(LifespanManager(app))
+            if settings.users_repository == "memory":
+                app.state.users_repository.load_users(seeded_users(args.users, args.prefix))
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url="http://testserver", timeout=30.0)
+        await stack.enter_async_context(client)
+
+        users = await asyncio.gather(*(sign_in(client, scenarios, args.users, args.prefix) for _ in range(args.concurrency)))
+
+        async def phase(seconds: float) -> None:
+            stop_at = perf_counter() + seconds
+            await asyncio.gather(*(virtual_user(client, user, scenarios, args.mix, recorder, stop_at) for user in users))
+
+        if args.warmup:
+            await phase(args.warmup)
+        recorder.recording = True
+        started_at = perf_counter()
+        await phase(args.duration)
+        elapsed = perf_counter() - started_at
+
+    return summarize(recorder, elapsed)
+
+
+async def _delete_signed_up_users(run_id: str) -> None:
+    deleted = await delete_users(f"load_{run_id}")
+    print(f"deleted {deleted:,} users signed up during the run")
+
+
+def print_summary(summary: dict[str, dict[str, float]]) -> None:
+    print(f"{'route':<20}{'requests':>10}{'errors':>8}{'req/s':>10}" + "".join(f"{f'p{q} ms':>10}" for q in PERCENTILES))
+    for route, stats in summary.items():
+        print(f"{route:<20}{stats['requests']:>10}{stats['errors']:>8}{stats['throughput']:>10.1f}" + "".join(f"{stats[f'p{q}_ms']:>10.2f}" for q in PERCENTILES))
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        route, _, weight = item.partition("=")
+        if route not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown route {route!r}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[route] = int(weight)
+    return mix
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server; the app runs in process when omitted")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds of load before measuring")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=10_000, help="number of seeded users to sign in as")
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="weights as route=weight,...")
+    parser.add_argument("--output", type=Path, help="save the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # one log line per request from the client would drown the results
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    summary = asyncio.run(run(args))
+    print_summary(summary)
+
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2) + "\n")
+    if args.baseline:
+        regressions = compare(summary, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Seed the users table with a synthetic dataset for load tests, through COPY.
+
+Every seeded user is ``{prefix}_{n}`` / ``{prefix}_{n}@bench.test`` with the password
+``SEED_PASSWORD``. The password is hashed once and the hash shared by every row, so even
+millions of users load in seconds; ``--reset`` first deletes the users a previous run left.
+``seeded_users`` builds the same dataset for the in-memory users repository.
+
+    python -m benchmarks.seed --users 100000 --reset
+"""
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+from time import perf_counter
+
+import asyncpg
+
+from app.core import security, settings
+from app.models.user import User
+
+SEED_PASSWORD = "benchmark"
+DEFAULT_PREFIX = "bench"
+COLUMNS = ("username", "email", "salt", "hashed_password")
+
+
+def seeded_user(prefix: str, n: int) -> dict[str, str]:
+    return {"username": f"{prefix}_{n}", "email": f"{prefix}_{n}@bench.test", "password": SEED_PASSWORD}
+
+
+def dsn() -> str:
+    # asyncpg takes the plain postgresql:// scheme, without SQLAlchemy's driver suffix
+    return str(settings.db_url).replace("+asyncpg", "", 1)
+
+
+def _records(prefix: str, start: int, stop: int, salt: str, hashed_password: str) -> Iterator[tuple[str, str, str, str]]:
+    for n in range(start, stop):
+        yield f"{prefix}_{n}", f"{prefix}_{n}@bench.test", salt, hashed_password
+
+
+def seeded_users(users: int, prefix: str = DEFAULT_PREFIX) -> Iterator[User]:
+    salt = security.generate_salt()
+    hashed_password = security.get_password_hash(salt + SEED_PASSWORD)
+    for n, record in enumerate(_records(prefix, 0, users, salt, hashed_password), start=1):
+        yield User(id=n, **dict(zip(COLUMNS, record)))
+
+
+async def seed(users: int, prefix: str = DEFAULT_PREFIX, reset: bool = False, batch_size: int = 100_000) -> int:
+    """Top the seeded users up to ``users`` and return how many were already there."""
+    salt = security.generate_salt()
+    hashed_password = security.get_password_hash(salt + SEED_PASSWORD)
+
+    conn = await asyncpg.connect(dsn())
+    try:
+        if reset:
+            await conn.execute("DELETE FROM users WHERE username LIKE $1", f"{prefix}\\_%")
+        existing = await conn.fetchval("SELECT count(*) FROM users WHERE username LIKE $1", f"{prefix}\\_%")
+        for start in range(existing, users, batch_size):
+            stop = min(start + batch_size, users)
+            await conn.copy_records_to_table("users", records=_records(prefix, start, stop, salt, hashed_password), columns=COLUMNS)
+            print(f"seeded {stop:,}/{users:,} users", flush=True)
+        await conn.execute("ANALYZE users")
+        return existing
+    finally:
+        await conn.close()
+
+
+async def delete_users(prefix: str) -> int:
+    """Delete the users named ``{prefix}_*`` and return how many there were."""
+    conn = await asyncpg.connect(dsn())
+    try:
+        status = await conn.execute("DELETE FROM users WHERE username LIKE $1", prefix.replace("_", "\\_") + "\\_%")
+    finally:
+        await conn.close()
+    return int(status.split()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX)
+    parser.add_argument("--reset", action="store_true", help="delete previously seeded users first")
+    args = parser.parse_args()
+
+    started_at = perf_counter()
+    existing = asyncio.run(seed(args.users, args.prefix, args.reset))
+    print(f"{args.users:,} users ready ({existing:,} kept from a previous run) in {perf_counter() - started_at:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from os import environ
+
+import pytest
+
+from app.api.dependencies.database import get_repository
+from app.api.dependencies.service import get_service
+from app.api.dependencies.users import get_users_filters
+from app.database.repositories.users import UsersRepository
+from app.services.users import UsersService
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_providers_are_shared() -> None:
+    assert get_repository(UsersRepository) is get_repository(UsersRepository)
+    assert get_service(UsersService) is get_service(UsersService)
+    assert await get_service(UsersService)() is await get_service(UsersService)()
+
+
+async def test_users_filters_resolve_defaults() -> None:
+    assert await get_users_filters(skip=None, limit=None) == await get_users_filters()
@@ -0,0 +1,22 @@
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_200_OK
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_metrics(app: FastAPI, client: AsyncClient) -> None:
+    await client.get(app.url_path_for("users:all"))
+    response = await client.get(app.url_path_for("monitoring:metrics"))
+    metrics = response.text
+
+    assert response.status_code == HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="users:all"' in metrics
+    assert 'http_requests_in_flight{route="monitoring:metrics"} 1.0' in metrics
+    assert 'app_db_queries_count{route="users:all"}' in metrics
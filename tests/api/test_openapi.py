@@ -0,0 +1,32 @@
+import json
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+from app.api.openapi import SCHEMA_PATH, schema_drift
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_committed_schema_is_up_to_date(app: FastAPI) -> None:
+    committed = json.loads(SCHEMA_PATH.read_text())
+
+    assert schema_drift(committed, app.openapi()) == [], "openapi.json is out of date, run `make openapi`"
+
+
+async def test_openapi_served_from_precomputed_bytes(app: FastAPI, client: AsyncClient) -> None:
+    response = await client.get(app.url_path_for("openapi"), headers={"Accept-Encoding": "gzip"})
+    etag = response.headers.get("etag")
+
+    assert response.status_code == HTTP_200_OK
+    assert response.headers.get("content-encoding") == "gzip"
+    assert response.json() == app.openapi()
+    assert response.content == app.state.openapi_document.body
+
+    response = await client.get(app.url_path_for("openapi"), headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == HTTP_304_NOT_MODIFIED
@@ -0,0 +1,98 @@
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND
+
+from app.core import settings
+from app.core.constant import (
+    FAIL_AUTH_DEBUG_ACCESS,
+    SUCCESS_DB_POOL_STATUS,
+    SUCCESS_GC_STATS,
+    SUCCESS_MEMORY_SNAPSHOT_DIFF,
+    SUCCESS_MEMORY_TRACING_STARTED,
+    SUCCESS_STARTUP_REPORT,
+)
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_db_pool_status(app: FastAPI, client: AsyncClient) -> None:
+    await client.get(app.url_path_for("users:all"))
+    response = await client.get(app.url_path_for("debug:db-pool"))
+    result = response.json()
+    pool = result.get("data")
+
+    assert response.status_code == HTTP_200_OK
+    assert result.get("message") == SUCCESS_DB_POOL_STATUS
+    assert pool.get("checkouts") >= 1
+    # the connection holding the test's transaction
+    assert pool.get("checked_out") == 1
+    assert pool.get("timeouts") == 0
+    assert pool.get("long_held") == []
+
+
+async def test_startup_report(app: FastAPI, client: AsyncClient) -> None:
+    response = await client.get(app.url_path_for("debug:startup"))
+    result = response.json()
+    report = result.get("data")
+
+    assert response.status_code == HTTP_200_OK
+    assert result.get("message") == SUCCESS_STARTUP_REPORT
+    assert report.get("finished") is True
+    assert list(report.get("phases")) == ["import", "create_app", "connect_db", "warmup.openapi", "warmup.serializers", "warmup.static", "warmup.hashing", "warmup.db_pool"]
+    assert report.get("total_ms") == pytest.approx(sum(report.get("phases").values()), abs=0.01)
+    assert app.openapi_schema is not None
+
+
+async def test_debug_access_required(app: FastAPI, client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "debug", False)
+    response = await client.get(app.url_path_for("debug:db-pool"))
+
+    assert response.status_code == HTTP_403_FORBIDDEN
+    assert response.json().get("detail") == FAIL_AUTH_DEBUG_ACCESS
+
+    monkeypatch.setattr(settings, "debug_token", "debug-token")
+    response = await client.get(app.url_path_for("debug:db-pool"), headers={settings.debug_token_header_key: "debug-token"})
+
+    assert response.status_code == HTTP_200_OK
+
+
+async def test_memory_snapshot_diff(app: FastAPI, client: AsyncClient) -> None:
+    response = await client.post(app.url_path_for("debug:memory-tracing-start"))
+    assert response.status_code == HTTP_200_OK
+    assert response.json().get("message") == SUCCESS_MEMORY_TRACING_STARTED
+
+    try:
+        first = (await client.post(app.url_path_for("debug:memory-snapshot"))).json().get("data").get("id")
+        allocated = [bytearray(1024) for _ in range(1000)]
+        second = (await client.post(app.url_path_for("debug:memory-snapshot"))).json().get("data").get("id")
+
+        response = await client.get(app.url_path_for("debug:memory-snapshot-diff"), params={"first": first, "second": second, "limit": 5})
+        result = response.json()
+
+        assert response.status_code == HTTP_200_OK
+        assert result.get("message") == SUCCESS_MEMORY_SNAPSHOT_DIFF
+        assert result.get("data")[0].get("size_diff") >= 1024 * len(allocated)
+        assert "test_debug.py" in result.get("data")[0].get("location")
+
+        response = await client.get(app.url_path_for("debug:memory-snapshot-diff"), params={"first": first, "second": -1})
+        assert response.status_code == HTTP_404_NOT_FOUND
+    finally:
+        response = await client.delete(app.url_path_for("debug:memory-tracing-stop"))
+
+    response = await client.post(app.url_path_for("debug:memory-snapshot"))
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+async def test_gc_stats(app: FastAPI, client: AsyncClient) -> None:
+    response = await client.get(app.url_path_for("debug:memory-gc"), params={"limit": 5})
+    result = response.json()
+
+    assert response.status_code == HTTP_200_OK
+    assert result.get("message") == SUCCESS_GC_STATS
+    assert len(result.get("data").get("generations")) == 3
+    assert len(result.get("data").get("objects")) == 5
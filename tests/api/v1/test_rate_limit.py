@@ -0,0 +1,32 @@
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+
+from app.core import settings
+from app.core.constant import FAIL_RATE_LIMITED
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_signin_limited_per_email(app: FastAPI, client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "rate_limit_auth_email_limit", 2)
+    credentials = dict(email="Limited_Tester@test.com", password="wrong")
+
+    for remaining in ("1", "0"):
+        response = await client.post(app.url_path_for("auth:signin"), json=credentials)
+        assert response.status_code != HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers.get("ratelimit-limit") == "2"
+        assert response.headers.get("ratelimit-remaining") == remaining
+
+    response = await client.post(app.url_path_for("auth:signin"), json=dict(credentials, email="limited_tester@test.com"))
+    assert response.status_code == HTTP_429_TOO_MANY_REQUESTS
+    assert response.json().get("detail") == FAIL_RATE_LIMITED
+    assert int(response.headers.get("retry-after")) > 0
+
+    response = await client.post(app.url_path_for("auth:signin"), json=dict(credentials, email="other_tester@test.com"))
+    assert response.status_code != HTTP_429_TOO_MANY_REQUESTS
@@ -3,15 +3,18 @@ from os import environ
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
+from pydantic import SecretStr
 
 # from fastapi.testclient import TestClient
 from starlette.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_400_BAD_REQUEST,
+    HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
 )
 
+from app.api.dependencies.settings import get_settings
 from app.core import settings
 from app.core.constant import (
     FAIL_VALIDATION_MATCHED_USER_EMAIL,
@@ -32,12 +35,7 @@ environ["APP_ENV"] = "test"
 pytestmark = pytest.mark.asyncio
 
 
-async def test_signup(
-    app: FastAPI,
-    client: AsyncClient,
-    random_user: dict[str, str],
-    created_random_user: dict[str, str],
-) -> None:
+async def test_signup(app: FastAPI, client: AsyncClient, random_user: dict[str, str]) -> None:
     response = await client.post(app.url_path_for("auth:signup"), json=random_user)
     result = response.json()
     created_user = result.get("data")
@@ -46,10 +44,13 @@ async def test_signup(
     assert created_user.get("username") == random_user.get("username")
     assert created_user.get("email") == random_user.get("email")
 
-    created_random_user["id"] = created_user.get("id")
 
-
-async def test_signup_duplicate_user(app: FastAPI, client: AsyncClient, random_user: dict[str, str]) -> None:
+async def test_signup_duplicate_user(
+    app: FastAPI,
+    client: AsyncClient,
+    random_user: dict[str, str],
+    created_random_user: dict[str, str],
+) -> None:
     response = await client.post(app.url_path_for("auth:signup"), json=random_user)
     result = response.json()
     assert response.status_code == HTTP_400_BAD_REQUEST
@@ -91,8 +92,6 @@ async def test_signin(app: FastAPI, client: AsyncClient, created_random_user: di
     assert token.get("access_token")
     assert token.get("token_type") == settings.jwt_token_prefix
 
-    created_random_user["token"] = token
-
 
 async def test_auth_info(app: FastAPI, client: AsyncClient, created_random_user: dict[str, str]) -> None:
     headers = {
@@ -111,7 +110,22 @@ async def test_auth_info(app: FastAPI, client: AsyncClient, created_random_user:
     assert result_user.get("email") == created_random_user.get("email")
 
 
-async def test_all_user(app: FastAPI, client: AsyncClient) -> None:
+async def test_auth_info_honours_settings_override(app: FastAPI, client: AsyncClient, created_random_user: dict[str, str]) -> None:
+    headers = {
+        "Authorization": f"{settings.jwt_token_prefix} {created_random_user.get('token').get('access_token')}",
+        **client.headers,
+    }
+    other_settings = settings.model_copy(update={"secret_key": SecretStr("another-secret")})
+    app.dependency_overrides[get_settings] = lambda: other_settings
+    try:
+        response = await client.get(app.url_path_for("auth:info"), headers=headers)
+    finally:
+        del app.dependency_overrides[get_settings]
+
+    assert response.status_code == HTTP_403_FORBIDDEN
+
+
+async def test_all_user(app: FastAPI, client: AsyncClient, created_random_user: dict[str, str]) -> None:
     response = await client.get(app.url_path_for("users:all"))
 
     result = response.json()
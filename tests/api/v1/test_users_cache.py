@@ -0,0 +1,32 @@
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_200_OK, HTTP_201_CREATED
+
+from app.core import settings
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_users_listing_cached_until_write(app: FastAPI, client: AsyncClient) -> None:
+    user = dict(username="cache_tester", password="123", email="cache_tester@test.com")
+    response = await client.post(app.url_path_for("auth:signup"), json=user)
+    assert response.status_code == HTTP_201_CREATED
+    headers = {"Authorization": f"{settings.jwt_token_prefix} {response.json().get('data').get('token').get('access_token')}"}
+
+    first = await client.get(app.url_path_for("users:all"), params={"limit": 1000})
+    second = await client.get(app.url_path_for("users:all"), params={"limit": 1000})
+
+    assert first.status_code == second.status_code == HTTP_200_OK
+    assert first.content == second.content
+    assert len(app.state.users_cache) == 1
+
+    response = await client.patch(app.url_path_for("user:patch-by-id"), json={"username": "cache_tester_renamed"}, headers=headers)
+    assert response.status_code == HTTP_200_OK
+
+    response = await client.get(app.url_path_for("users:all"), params={"limit": 1000})
+    assert "cache_tester_renamed" in [listed.get("username") for listed in response.json().get("data")]
@@ -1,16 +1,134 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import subprocess
+import sys
+from collections.abc import AsyncGenerator, Iterator
+from functools import cache
 from os import environ
+from pathlib import Path
 from typing import Any
 
+import asyncpg
+import pytest
 import pytest_asyncio
+from alembic.script import ScriptDirectory
 from asgi_lifespan import LifespanManager
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
 environ["APP_ENV"] = "test"
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+MIGRATIONS_PATH = PROJECT_ROOT / "app" / "database" / "migraions"
+# any constant works, it only has to be the same for every worker
+TEMPLATE_LOCK_ID = 0x7E57DB
+
+
+def _asyncpg_dsn(url: URL) -> str:
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def _migrated_revision(url: URL) -> str | None:
+    conn = await asyncpg.connect(_asyncpg_dsn(url))
+    try:
+        return await conn.fetchval("SELECT version_num FROM alembic_version")
+    except asyncpg.UndefinedTableError:
+        return None
+    finally:
+        await conn.close()
+
+
+async def _create_worker_database(admin_url: URL, template_url: URL, worker_url: URL) -> None:
+    """Copy the worker's database from a migrated template, building the template when it is missing or outdated."""
+    head = ScriptDirectory(str(MIGRATIONS_PATH)).get_current_head()
+    conn = await asyncpg.connect(_asyncpg_dsn(admin_url))
+    try:
+        # workers start together: the first builds the template while the others wait for it
+        await conn.execute("SELECT pg_advisory_lock($1)", TEMPLATE_LOCK_ID)
+        try:
+            exists = await conn.fetchval("SELECT true FROM pg_database WHERE datname = $1", template_url.database)
+            if not exists or await _migrated_revision(template_url) != head:
+                await conn.execute(f'DROP DATABASE IF EXISTS "{template_url.database}" WITH (FORCE)')
+                await conn.execute(f'CREATE DATABASE "{template_url.database}"')
+                subprocess.run(
+                    [sys.executable, "-m", "alembic", "upgrade", "head"],
+                    cwd=PROJECT_ROOT,
+                    env={**environ, "DB_URL": template_url.render_as_string(hide_password=False)},
+                    check=True,
+                    capture_output=True,
+                )
+            await conn.execute(f'DROP DATABASE IF EXISTS "{worker_url.database}" WITH (FORCE)')
+            await conn.execute(f'CREATE DATABASE "{worker_url.database}" TEMPLATE "{template_url.database}"')
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", TEMPLATE_LOCK_ID)
+    finally:
+        await conn.close()
+
+
+async def _drop_database(admin_url: URL, url: URL) -> None:
+    conn = await asyncpg.connect(_asyncpg_dsn(admin_url))
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)')
+    finally:
+        await conn.close()
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """One loop for the whole run, so the session engine's pooled connections outlive a test.
+
+    pytest-asyncio 0.23 warns that redefining it is deprecated; the replacement, a loop scope
+    for fixtures, only arrives in 0.24.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def database_url(event_loop: asyncio.AbstractEventLoop) -> Iterator[str]:
+    """A database of its own for this pytest-xdist worker, or for the whole run without xdist.
+
+    Only tests that use the database request it, through ``engine``, so the rest run without Postgres.
+    """
+    from app.core import settings
+
+    admin_url = make_url(str(settings.db_url))
+    worker = environ.get("PYTEST_XDIST_WORKER", "main")
+    template_url = admin_url.set(database=f"{admin_url.database}_test_template")
+    worker_url = admin_url.set(database=f"{admin_url.database}_test_{worker}")
+    event_loop.run_until_complete(_create_worker_database(admin_url, template_url, worker_url))
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(settings, "db_url", worker_url.render_as_string(hide_password=False))
+        yield settings.db_url
+
+    event_loop.run_until_complete(_drop_database(admin_url, worker_url))
+
+
+@pytest.fixture(scope="session")
+def engine(database_url: str, event_loop: asyncio.AbstractEventLoop) -> Iterator[AsyncEngine]:
+    from app.core import settings
+    from app.database.events import create_db_engine
+
+    engine = create_db_engine(settings, pool_size=10, max_overflow=0, echo=False)
+    yield engine
+    # the pooled connections belong to the tests' loop, so they are closed on it
+    event_loop.run_until_complete(engine.dispose())
+
+
+@pytest_asyncio.fixture
+async def connection(engine: AsyncEngine) -> AsyncGenerator[AsyncConnection]:
+    """A connection inside a transaction that is rolled back once the test is done."""
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            yield connection
+        finally:
+            await transaction.rollback()
+
 
 @pytest_asyncio.fixture
 def app() -> FastAPI:
@@ -20,25 +138,20 @@ def app() -> FastAPI:
 
 
 @pytest_asyncio.fixture
-async def initialized_app(app: FastAPI) -> AsyncGenerator[FastAPI]:
-    from app.core import settings
+async def initialized_app(app: FastAPI, engine: AsyncEngine, connection: AsyncConnection) -> AsyncGenerator[FastAPI]:
+    from app.database.events import create_session_factory
 
     async with LifespanManager(app):
-        engine = create_async_engine(
-            url=str(settings.db_url),
-            pool_size=10,
-            max_overflow=0,
-            echo=False,
-            future=True,
-        )
-        async_session_factory = sessionmaker(
-            bind=engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
-            autoflush=True,
-        )
-        app.state.pool = async_session_factory
-        yield app
+        lifespan_engine = app.state.engine
+        await lifespan_engine.dispose()
+        app.state.engine = engine
+        # every session of the test joins its transaction, commits only release a SAVEPOINT
+        app.state.pool = create_session_factory(connection, join_transaction_mode="create_savepoint")
+        try:
+            yield app
+        finally:
+            # the shutdown disposes ``app.state.engine``, the shared one has to outlive this test
+            app.state.engine = lifespan_engine
 
 
 @pytest_asyncio.fixture
@@ -51,7 +164,7 @@ async def client(initialized_app: FastAPI) -> AsyncGenerator[AsyncClient]:
         yield client
 
 
-@pytest_asyncio.fixture(scope="module")
+@pytest_asyncio.fixture
 def random_user() -> dict[str, str]:
     return dict(
         username="tester",
@@ -65,14 +178,27 @@ def filter_params() -> dict[str, Any]:
     return dict(skip=0, limit=100)
 
 
-@pytest_asyncio.fixture(scope="module")
-def created_random_user() -> dict[str, str]:
-    return dict(
-        id=None,
-        username="tester",
-        password="123",
-        email="tester@test.com",
-    )
+@cache
+def _hash_password(password: str) -> tuple[str, str]:
+    from app.core import security
+
+    salt = security.generate_salt()
+    return salt, security.get_password_hash(salt + password)
+
+
+@pytest_asyncio.fixture
+async def created_random_user(connection: AsyncConnection, random_user: dict[str, str]) -> dict[str, Any]:
+    """``random_user`` inserted in the test's transaction, with a token; bcrypt runs once per password per run."""
+    from app.core import settings
+    from app.core.token import create_token_for_user
+    from app.models.user import User
+
+    salt, hashed_password = _hash_password(random_user["password"])
+    query = insert(User).values(username=random_user["username"], email=random_user["email"], salt=salt, hashed_password=hashed_password)
+    user_id = (await connection.execute(query.returning(User.id))).scalar_one()
+    user = User(id=user_id, username=random_user["username"], email=random_user["email"])
+    token = create_token_for_user(user, settings.secret_key.get_secret_value())
+    return dict(random_user, id=user_id, token=token.model_dump())
 
 
 @pytest_asyncio.fixture(scope="module")
@@ -85,7 +211,7 @@ def update_target_user() -> dict[str, str]:
     )
 
 
-@pytest_asyncio.fixture(scope="module")
+@pytest_asyncio.fixture
 def invalid_user() -> dict[str, str]:
     return dict(
         id=-1,
@@ -0,0 +1,32 @@
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+
+from app.core.constant import FAIL_QUERY_BUDGET_EXCEEDED
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    from app.core import settings
+    from app.main import create_app  # local import for testing purpose
+
+    monkeypatch.setattr(settings, "db_query_budget", 1)
+    return create_app()
+
+
+async def test_query_budget_exceeded(app: FastAPI, client: AsyncClient) -> None:
+    user = dict(username="budget_tester", password="123", email="budget_tester@test.com")
+    response = await client.post(app.url_path_for("auth:signup"), json=user)
+    result = response.json()
+
+    assert response.status_code == HTTP_500_INTERNAL_SERVER_ERROR
+    assert result.get("app_exception") == "Response5XX"
+    assert result["context"].get("reason") == FAIL_QUERY_BUDGET_EXCEEDED
+    assert result["context"].get("route") == "auth:signup"
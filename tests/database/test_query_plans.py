@@ -0,0 +1,156 @@
+"""Query-plan regression tests for the statements ``UsersRepository`` sends.
+
+A representative dataset is seeded and analyzed inside the test transaction, every
+statement a repository call executes is captured with its parameters, and its
+``EXPLAIN (FORMAT JSON)`` plan is checked: the expected indexes are used, ``users`` is never
+scanned sequentially and the estimated rows and cost stay within bounds. Costs are compared
+to a full sequential scan of the seeded table, so the bounds don't depend on the planner's
+cost constants.
+"""
+
+import json
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from os import environ
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database.events import create_session_factory
+from app.database.repositories.users import UsersRepository
+from app.schemas.user import UserInCreate
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+SEEDED_USERS = 50_000
+# every tenth seeded user is soft-deleted, so lookups have dead rows to skip
+SEED_USERS_SQL = """
+INSERT INTO users (username, email, salt, hashed_password, deleted_at)
+SELECT 'plan_' || n, 'plan_' || n || '@plan.test', 'salt', 'hash', CASE WHEN n % 10 = 0 THEN now() END
+FROM generate_series(1, :users) AS n
+"""
+
+
+@dataclass(frozen=True)
+class PlanExpectation:
+    indexes: frozenset[str]
+    max_rows: int
+    # the most the statement may cost, as a share of a sequential scan of ``users``
+    max_cost_share: float
+
+
+@dataclass(frozen=True)
+class Plan:
+    root: dict[str, Any]
+
+    @property
+    def nodes(self) -> Iterator[dict[str, Any]]:
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.get("Plans", ()))
+
+    @property
+    def indexes(self) -> set[str]:
+        return {node["Index Name"] for node in self.nodes if "Index Name" in node}
+
+    @property
+    def seq_scanned(self) -> set[str]:
+        return {node["Relation Name"] for node in self.nodes if node["Node Type"] == "Seq Scan"}
+
+    @property
+    def rows(self) -> int:
+        return self.root["Plan Rows"]
+
+    @property
+    def cost(self) -> float:
+        return self.root["Total Cost"]
+
+
+async def explain(connection: AsyncConnection, statement: str, parameters: Any = ()) -> Plan:
+    raw_result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    document = raw_result.scalar_one()
+    return Plan(root=(json.loads(document) if isinstance(document, str) else document)[0]["Plan"])
+
+
+@contextmanager
+def capture_statements(connection: AsyncConnection) -> Iterator[list[tuple[str, Any]]]:
+    """Collect the statements executed on ``connection`` with their driver-level parameters."""
+    statements: list[tuple[str, Any]] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(connection.sync_connection, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", _before_cursor_execute)
+
+
+@pytest_asyncio.fixture
+async def seeded(connection: AsyncConnection) -> AsyncGenerator[float]:
+    """Seed and analyze ``users``, both rolled back with the test, and yield the cost of a full scan."""
+    await connection.execute(text(SEED_USERS_SQL), {"users": SEEDED_USERS})
+    await connection.exec_driver_sql("ANALYZE users")
+    yield (await explain(connection, "SELECT * FROM users")).cost
+
+
+@pytest_asyncio.fixture
+async def users_repo(connection: AsyncConnection) -> AsyncGenerator[UsersRepository]:
+    async with create_session_factory(connection, join_transaction_mode="create_savepoint")() as session:
+        yield UsersRepository(session)
+
+
+def _duplicate_of(n: int) -> UserInCreate:
+    return UserInCreate(username=f"plan_{n}", email=f"other_{n}@plan.test", password="secret")
+
+
+REPOSITORY_CALLS: dict[str, tuple[Callable[[UsersRepository], Awaitable[Any]], PlanExpectation]] = {
+    "get_user_by_id": (
+        lambda repo: repo.get_user_by_id(user_id=SEEDED_USERS // 2),
+        PlanExpectation(indexes=frozenset({"users_pkey"}), max_rows=1, max_cost_share=0.01),
+    ),
+    "get_user_by_email": (
+        lambda repo: repo.get_user_by_email(email=f"plan_{SEEDED_USERS // 2 + 1}@plan.test"),
+        PlanExpectation(indexes=frozenset({"ix_users_email"}), max_rows=1, max_cost_share=0.01),
+    ),
+    "get_duplicated_user": (
+        lambda repo: repo.get_duplicated_user(user_in=_duplicate_of(SEEDED_USERS // 2 + 1)),
+        # two index lookups and their heap fetches, about 1.6% of a scan of the freshly seeded table
+        PlanExpectation(indexes=frozenset({"ix_users_username", "ix_users_email"}), max_rows=2, max_cost_share=0.03),
+    ),
+    "get_filtered_users.first_page": (
+        lambda repo: repo.get_filtered_users(skip=0, limit=100),
+        PlanExpectation(indexes=frozenset({"users_pkey"}), max_rows=100, max_cost_share=0.05),
+    ),
+    "get_filtered_users.deep_page": (
+        lambda repo: repo.get_filtered_users(skip=10_000, limit=100),
+        PlanExpectation(indexes=frozenset({"users_pkey"}), max_rows=100, max_cost_share=0.5),
+    ),
+}
+
+
+@pytest.mark.parametrize("call", REPOSITORY_CALLS)
+async def test_repository_query_plan(connection: AsyncConnection, seeded: float, users_repo: UsersRepository, call: str) -> None:
+    run, expected = REPOSITORY_CALLS[call]
+    with capture_statements(connection) as statements:
+        await run(users_repo)
+
+    queries = [(statement, parameters) for statement, parameters in statements if statement.lstrip().upper().startswith("SELECT")]
+    assert queries, f"{call} executed no query"
+
+    for statement, parameters in queries:
+        plan = await explain(connection, statement, parameters)
+
+        assert "users" not in plan.seq_scanned, f"{call} scans users sequentially:\n{statement}"
+        assert expected.indexes <= plan.indexes, f"{call} uses {sorted(plan.indexes)}, expected {sorted(expected.indexes)}:\n{statement}"
+        assert plan.rows <= expected.max_rows, f"{call} estimates {plan.rows} rows, at most {expected.max_rows} expected"
+        assert plan.cost <= seeded * expected.max_cost_share, f"{call} costs {plan.cost:.1f}, over {expected.max_cost_share:.0%} of a full scan ({seeded:.1f})"
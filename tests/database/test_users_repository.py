@@ -0,0 +1,114 @@
+from collections.abc import AsyncGenerator
+from os import environ
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.status import HTTP_201_CREATED
+
+from app.database.events import create_session_factory
+from app.database.repositories.users import UsersRepository
+from app.database.repositories.users_memory import InMemoryUsersRepository
+from app.schemas.user import UserInCreate, UserInUpdate
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture(params=["sql", "memory"])
+async def repository(request: pytest.FixtureRequest, connection: AsyncConnection) -> AsyncGenerator[UsersRepository]:
+    """Every test runs against both backends, which must behave the same."""
+    if request.param == "memory":
+        yield InMemoryUsersRepository()
+        return
+
+    async with create_session_factory(connection, join_transaction_mode="create_savepoint")() as session:
+        yield UsersRepository(session)
+
+
+def _user_in(name: str) -> UserInCreate:
+    return UserInCreate(username=name, email=f"{name}@test.com", password="secret")
+
+
+async def test_signup_and_lookups(repository: UsersRepository) -> None:
+    created = await repository.signup_user(user_in=_user_in("conformance_a"))
+
+    assert created.id is not None
+    assert created.created_at is not None
+    assert created.deleted_at is None
+    assert await repository.get_user_password_validation(user=created, password="secret")
+
+    by_id = await repository.get_user_by_id(user_id=created.id)
+    by_email = await repository.get_user_by_email(email="conformance_a@test.com")
+    assert by_id.username == by_email.username == "conformance_a"
+    assert await repository.get_user_by_id(user_id=created.id + 1000) is None
+    assert await repository.get_user_by_email(email="missing@test.com") is None
+
+
+async def test_duplicated_user(repository: UsersRepository) -> None:
+    created = await repository.signup_user(user_in=_user_in("conformance_b"))
+
+    same_username = UserInCreate(username="conformance_b", email="other@test.com", password="secret")
+    same_email = UserInCreate(username="other", email="conformance_b@test.com", password="secret")
+    assert (await repository.get_duplicated_user(user_in=same_username)).id == created.id
+    assert (await repository.get_duplicated_user(user_in=same_email)).id == created.id
+    assert await repository.get_duplicated_user(user_in=_user_in("conformance_c")) is None
+
+
+async def test_deleted_user(repository: UsersRepository) -> None:
+    created = await repository.signup_user(user_in=_user_in("conformance_d"))
+    deleted = await repository.delete_user(user=created)
+
+    assert deleted.deleted_at is not None
+    assert await repository.get_user_by_email(email="conformance_d@test.com") is None
+    assert await repository.get_duplicated_user(user_in=_user_in("conformance_d")) is None
+    assert (await repository.get_user_by_id(user_id=created.id)).deleted_at is not None
+
+    recreated = await repository.signup_user(user_in=_user_in("conformance_d"))
+    assert recreated.id > created.id
+    assert (await repository.get_user_by_email(email="conformance_d@test.com")).id == recreated.id
+
+
+async def test_filtered_users_pages_by_id(repository: UsersRepository) -> None:
+    created = [await repository.signup_user(user_in=_user_in(f"conformance_page_{n}")) for n in range(5)]
+    await repository.delete_user(user=created[1])
+
+    every_user = await repository.get_filtered_users(skip=0, limit=1000)
+    ids = [user.id for user in every_user]
+    assert ids == sorted(ids)
+    assert [user.id for user in created] == [user_id for user_id in ids if user_id >= created[0].id]
+
+    offset = ids.index(created[0].id)
+    page = await repository.get_filtered_users(skip=offset + 1, limit=2)
+    assert [user.id for user in page] == [created[1].id, created[2].id]
+
+
+async def test_update_user(repository: UsersRepository) -> None:
+    created = await repository.signup_user(user_in=_user_in("conformance_e"))
+
+    updated = await repository.update_user(user=created, user_in=UserInUpdate(email="conformance_e2@test.com", password="changed"))
+
+    assert updated.id == created.id
+    assert updated.username == "conformance_e"
+    assert await repository.get_user_password_validation(user=updated, password="changed")
+    assert not await repository.get_user_password_validation(user=updated, password="secret")
+    assert await repository.get_user_by_email(email="conformance_e@test.com") is None
+    assert (await repository.get_user_by_email(email="conformance_e2@test.com")).id == created.id
+
+
+async def test_memory_backend_serves_the_app(monkeypatch: pytest.MonkeyPatch) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core import settings
+    from app.main import create_app  # local import for testing purpose
+
+    monkeypatch.setattr(settings, "users_repository", "memory")
+    app = create_app()
+    user = dict(username="conformance_app", password="secret", email="conformance_app@test.com")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.post(app.url_path_for("auth:signup"), json=user)
+
+    assert response.status_code == HTTP_201_CREATED
+    assert (await app.state.users_repository.get_user_by_email(email=user["email"])).username == user["username"]
@@ -0,0 +1,123 @@
+import asyncio
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from starlette.status import HTTP_200_OK, HTTP_504_GATEWAY_TIMEOUT
+
+from app.core import settings
+from app.core.constant import FAIL_DEADLINE_EXCEEDED
+from app.database.deadline import QUERY_CANCELED_SQLSTATE
+from app.database.repositories.base import db_error_handler
+from app.middleware import DeadlinePolicy, RouteNameResolver
+from app.utils import AppExceptionCase
+from app.utils.request_context import new_request_context, request_context
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    from app.main import create_app  # local import for testing purpose
+
+    monkeypatch.setattr(settings, "request_timeouts_ms", {"users:all": 0.001})
+    return create_app()
+
+
+async def test_deadline_policy_header_is_capped(app: FastAPI) -> None:
+    policy = DeadlinePolicy(default=1.0, per_route={}, maximum=5.0, header_key="X-Request-Timeout", route_names=RouteNameResolver())
+    scope = {"type": "http", "app": app, "method": "GET", "path": "/", "headers": []}
+
+    assert policy.timeout(scope) == 1.0
+    assert policy.timeout({**scope, "headers": [(b"x-request-timeout", b"250")]}) == 0.25
+    assert policy.timeout({**scope, "headers": [(b"x-request-timeout", b"60000")]}) == 5.0
+    assert policy.timeout({**scope, "headers": [(b"x-request-timeout", b"soon")]}) == 1.0
+
+
+async def test_route_deadline_exceeded(app: FastAPI, client: AsyncClient, created_random_user: dict[str, str]) -> None:
+    response = await client.get(app.url_path_for("users:all"))
+
+    assert response.status_code == HTTP_504_GATEWAY_TIMEOUT
+    assert response.json().get("context", {}).get("reason") == FAIL_DEADLINE_EXCEEDED
+
+    response = await client.get(app.url_path_for("users:all"), headers={settings.request_timeout_header_key: "5000"})
+    assert response.status_code == HTTP_200_OK
+
+
+async def test_statement_timeout_follows_deadline(initialized_app: FastAPI) -> None:
+    context = new_request_context({"type": "http"})
+    context.deadline = context.started_at + 0.1
+    token = request_context.set(context)
+    try:
+        async with initialized_app.state.pool() as session:
+            with pytest.raises(DBAPIError) as exc_info:
+                await session.execute(text("SELECT pg_sleep(2)"))
+    finally:
+        request_context.reset(token)
+
+    assert exc_info.value.orig.sqlstate == QUERY_CANCELED_SQLSTATE
+
+
+async def test_statement_timeout_is_not_counted(initialized_app: FastAPI) -> None:
+    async def count_queries(deadline: float | None) -> int:
+        context = new_request_context({"type": "http"})
+        context.deadline = context.started_at + deadline if deadline is not None else None
+        token = request_context.set(context)
+        try:
+            async with initialized_app.state.pool() as session:
+                await session.execute(text("SELECT 1"))
+                await session.commit()
+                await session.execute(text("SELECT 1"))
+        finally:
+            request_context.reset(token)
+        return context.query_count
+
+    # every transaction starts with a SET LOCAL under a deadline, none of them is the request's
+    assert await count_queries(deadline=5.0) == await count_queries(deadline=None)
+
+
+async def test_statement_timeout_fires_before_client_deadline(initialized_app: FastAPI) -> None:
+    @db_error_handler
+    async def slow_query(session) -> None:
+        await session.execute(text("SELECT pg_sleep(2)"))
+
+    context = new_request_context({"type": "http"})
+    context.deadline = context.started_at + 0.1
+    token = request_context.set(context)
+    try:
+        async with initialized_app.state.pool() as session:
+            with pytest.raises(AppExceptionCase) as exc_info:
+                await slow_query(session)
+
+            # Postgres cancelled the statement, so the connection is still in a known state
+            await session.rollback()
+            context.deadline = None
+            assert (await session.execute(text("SELECT 1"))).scalar_one() == 1
+    finally:
+        request_context.reset(token)
+
+    assert exc_info.value.status_code == HTTP_504_GATEWAY_TIMEOUT
+
+
+async def test_client_deadline_outside_a_statement() -> None:
+    @db_error_handler
+    async def stalled() -> None:
+        # e.g. waiting for a pooled connection, which no statement_timeout covers
+        await asyncio.sleep(2)
+
+    context = new_request_context({"type": "http"})
+    context.deadline = context.started_at + 0.05
+    token = request_context.set(context)
+    try:
+        with pytest.raises(AppExceptionCase) as exc_info:
+            await stalled()
+    finally:
+        request_context.reset(token)
+
+    assert exc_info.value.status_code == HTTP_504_GATEWAY_TIMEOUT
+    assert context.elapsed < 1
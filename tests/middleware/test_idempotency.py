@@ -0,0 +1,39 @@
+import asyncio
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_201_CREATED, HTTP_422_UNPROCESSABLE_ENTITY
+
+from app.core import settings
+from app.core.constant import FAIL_IDEMPOTENCY_KEY_REUSED
+from app.core.token import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.middleware import IdempotencyMiddleware, RouteNameResolver
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_signup_retries_replay_first_response(app: FastAPI, client: AsyncClient) -> None:
+    user = dict(username="idempotent_tester", password="123", email="idempotent_tester@test.com")
+    headers = {"Idempotency-Key": "signup-1"}
+
+    responses = await asyncio.gather(*(client.post(app.url_path_for("auth:signup"), json=user, headers=headers) for _ in range(3)))
+
+    assert [response.status_code for response in responses] == [HTTP_201_CREATED] * 3
+    assert len({response.content for response in responses}) == 1
+    assert sum(response.headers.get("idempotent-replayed") == "true" for response in responses) == 2
+
+    response = await client.post(app.url_path_for("auth:signup"), json=dict(user, username="someone_else"), headers=headers)
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json().get("detail") == FAIL_IDEMPOTENCY_KEY_REUSED
+
+
+async def test_responses_outlive_no_access_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    # a replayed signup hands out the stored token again, so it must not be kept past its expiry
+    monkeypatch.setattr(settings, "idempotency_ttl_s", 24 * 60 * 60)
+    middleware = IdempotencyMiddleware(FastAPI(), settings=settings, route_names=RouteNameResolver())
+
+    assert middleware.store.ttl == ACCESS_TOKEN_EXPIRE_MINUTES * 60
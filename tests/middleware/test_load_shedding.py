@@ -0,0 +1,54 @@
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
+
+from app.core import settings
+from app.core.constant import FAIL_SERVICE_OVERLOADED
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def limits() -> dict[str, int]:
+    return {"default": 50, "auth": 0}
+
+
+@pytest.fixture
+def app(monkeypatch: pytest.MonkeyPatch, limits: dict[str, int]) -> FastAPI:
+    from app.main import create_app  # local import for testing purpose
+
+    monkeypatch.setattr(settings, "load_shedding_limits", limits)
+    monkeypatch.setattr(settings, "load_shedding_max_queue", 0)
+    return create_app()
+
+
+async def test_auth_budget_is_shed_separately(app: FastAPI, client: AsyncClient, created_random_user: dict[str, str]) -> None:
+    user = dict(username="shed_tester", password="123", email="shed_tester@test.com")
+    response = await client.post(app.url_path_for("auth:signup"), json=user)
+
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers.get("retry-after") == "1"
+    assert response.json().get("detail") == FAIL_SERVICE_OVERLOADED
+
+    response = await client.get(app.url_path_for("users:all"))
+    assert response.status_code == HTTP_200_OK
+
+    response = await client.get(app.url_path_for("openapi"))
+    assert response.status_code == HTTP_200_OK
+
+
+@pytest.mark.parametrize("limits", [{"default": 0, "auth": 0}])
+async def test_monitoring_is_never_shed(app: FastAPI, client: AsyncClient) -> None:
+    response = await client.get(app.url_path_for("users:all"))
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+
+    response = await client.get(app.url_path_for("monitoring:metrics"))
+    assert response.status_code == HTTP_200_OK
+
+    response = await client.get(app.url_path_for("health:ready"))
+    assert response.status_code == HTTP_200_OK
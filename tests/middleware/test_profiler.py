@@ -0,0 +1,55 @@
+import asyncio
+from os import environ
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_200_OK
+
+from app.core import settings
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def profiling_dir(tmp_path: Path) -> Path:
+    return tmp_path / "profiles"
+
+
+@pytest.fixture
+def app(monkeypatch: pytest.MonkeyPatch, profiling_dir: Path) -> FastAPI:
+    from app.main import create_app  # local import for testing purpose
+
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_dir", str(profiling_dir))
+    return create_app()
+
+
+async def test_profile_request(app: FastAPI, client: AsyncClient, profiling_dir: Path, created_random_user: dict[str, str]) -> None:
+    # a successful sign-in verifies the bcrypt hash on the event loop, long enough to be sampled
+    user = dict(email=created_random_user["email"], password=created_random_user["password"])
+    response = await client.post(app.url_path_for("auth:signin"), json=user, params={"profile": "1"})
+    profile_file = profiling_dir / response.headers["x-profile-file"]
+
+    assert response.status_code == HTTP_200_OK
+    assert profile_file.name == f"{response.headers['x-request-id']}.collapsed"
+
+    for _ in range(100):
+        if profile_file.exists():
+            break
+        await asyncio.sleep(0.01)
+
+    stacks = profile_file.read_text().splitlines()
+    assert stacks
+    assert all(stack.rsplit(" ", 1)[1].isdigit() for stack in stacks)
+    assert any("verify_password" in stack for stack in stacks)
+
+
+async def test_profile_not_triggered(app: FastAPI, client: AsyncClient, created_random_user: dict[str, str]) -> None:
+    response = await client.get(app.url_path_for("users:all"))
+
+    assert response.status_code == HTTP_200_OK
+    assert "x-profile-file" not in response.headers
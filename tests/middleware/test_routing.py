@@ -0,0 +1,37 @@
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+
+from app.middleware.routing import ROUTE_NAME_KEY, UNMATCHED_ROUTE, RouteNameResolver
+
+environ["APP_ENV"] = "test"
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/users/{user_id}", name="users:one")
+    async def read_user(user_id: int) -> None: ...
+
+    return app
+
+
+def test_route_name_is_matched_once_per_request(app: FastAPI) -> None:
+    resolve_route_name = RouteNameResolver()
+    scope = {"type": "http", "app": app, "method": "GET", "path": "/users/1"}
+
+    assert resolve_route_name(scope) == "users:one"
+    assert scope[ROUTE_NAME_KEY] == "users:one"
+
+    # a later middleware reads the name from the scope instead of matching again
+    scope[ROUTE_NAME_KEY] = "cached"
+    assert resolve_route_name(scope) == "cached"
+
+
+def test_unknown_path_is_unmatched(app: FastAPI) -> None:
+    resolve_route_name = RouteNameResolver()
+
+    assert resolve_route_name({"type": "http", "app": app, "method": "GET", "path": "/missing"}) == UNMATCHED_ROUTE
+    assert resolve_route_name({"type": "http", "app": app, "method": "DELETE", "path": "/users/1"}) == UNMATCHED_ROUTE
@@ -0,0 +1,62 @@
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_200_OK, HTTP_201_CREATED
+
+from app.core import settings
+from app.utils.request_context import PhaseTimer, new_request_context, request_context
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    from app.main import create_app  # local import for testing purpose
+
+    monkeypatch.setattr(settings, "server_timing_enabled", True)
+    return create_app()
+
+
+def _timing_names(header: str) -> set[str]:
+    return {metric.split(";")[0].strip() for metric in header.split(",")}
+
+
+def _durations(header: str) -> dict[str, float]:
+    return {name.strip(): float(duration.split("=")[1]) for name, duration, *_ in (metric.split(";") for metric in header.split(","))}
+
+
+async def test_server_timing(app: FastAPI, client: AsyncClient) -> None:
+    user = dict(username="timing_tester", password="123", email="timing_tester@test.com")
+    response = await client.post(app.url_path_for("auth:signup"), json=user)
+
+    assert response.status_code == HTTP_201_CREATED
+    assert {"db", "service", "hash", "serialize", "total"} <= _timing_names(response.headers["server-timing"])
+    durations = _durations(response.headers["server-timing"])
+    assert sum(duration for name, duration in durations.items() if name != "total") <= durations["total"]
+
+    access_token = response.json().get("data").get("token").get("access_token")
+    headers = {"Authorization": f"{settings.jwt_token_prefix} {access_token}", **client.headers}
+    response = await client.delete(app.url_path_for("user:delete-by-id"), headers=headers)
+
+    assert response.status_code == HTTP_200_OK
+    assert {"auth", "db", "service", "total"} <= _timing_names(response.headers["server-timing"])
+
+
+async def test_nested_phases_are_exclusive() -> None:
+    context = new_request_context({}, timings={})
+    token = request_context.set(context)
+    try:
+        with PhaseTimer("service"):
+            context.query_time += 0.5  # as if a query ran inside the service
+            with PhaseTimer("serialize"):
+                pass
+    finally:
+        request_context.reset(token)
+
+    assert context.timings["service"] >= 0
+    assert context.timings["service"] + context.timings["serialize"] == pytest.approx(context.phase_time)
+    assert context.timings["service"] < 0.5
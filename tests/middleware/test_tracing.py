@@ -0,0 +1,50 @@
+import json
+from os import environ
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_400_BAD_REQUEST
+
+from app.core import settings
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def trace_file(tmp_path: Path) -> Path:
+    return tmp_path / "traces.json"
+
+
+@pytest.fixture
+def app(monkeypatch: pytest.MonkeyPatch, trace_file: Path) -> FastAPI:
+    from app.main import create_app  # local import for testing purpose
+
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "tracing_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "tracing_file", str(trace_file))
+    return create_app()
+
+
+async def test_tracing(app: FastAPI, client: AsyncClient, trace_file: Path) -> None:
+    user = dict(username="", password="", email="tracing_tester@test.com")
+    response = await client.post(app.url_path_for("auth:signin"), json=user)
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+    app.state.trace_exporter.close()
+    events = json.loads(trace_file.read_text().rstrip(",\n") + "]")
+    names = {event["name"] for event in events}
+
+    assert {
+        "http.POST",
+        "middleware.RequestContextMiddleware",
+        "dependency.get_repository.UsersRepository",
+        "service.UsersService.signin_user",
+        "repository.UsersRepository.get_user_by_email",
+        "db.query",
+    } <= names
+    assert {event["args"]["correlation_id"] for event in events} == {response.headers["x-request-id"]}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
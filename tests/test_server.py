@@ -0,0 +1,57 @@
+import os
+from os import environ
+from pathlib import Path
+
+import pytest
+
+from app.core import settings
+from app.server import autotune_workers, build_config, multiprocess_metrics_dir
+
+environ["APP_ENV"] = "test"
+
+
+@pytest.mark.parametrize(
+    "cpus, pool_size, max_connections, expected",
+    [(8, 10, 100, 8), (8, 25, 100, 4), (8, 50, 40, 1), (1, 10, 100, 1)],
+)
+def test_autotune_workers(monkeypatch: pytest.MonkeyPatch, cpus: int, pool_size: int, max_connections: int, expected: int) -> None:
+    monkeypatch.setattr(settings, "server_workers", None)
+    monkeypatch.setattr(settings, "db_pool_size", pool_size)
+    monkeypatch.setattr(settings, "db_max_overflow", 0)
+    monkeypatch.setattr(settings, "db_max_connections", max_connections)
+
+    assert autotune_workers(settings, cpus=cpus) == expected
+
+
+def test_build_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "server_max_requests", 500)
+    config = build_config(settings, workers=3)
+
+    assert config.workers == 3
+    assert config.max_requests == 500
+    assert config.graceful_timeout == settings.server_graceful_timeout
+    assert config.shutdown_timeout > settings.db_drain_timeout
+    assert config.bind == [f"{settings.server_host}:{settings.server_port}"]
+
+
+def test_multiprocess_metrics_dir_is_temporary(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+    with multiprocess_metrics_dir(workers=2):
+        path = Path(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+        assert path.is_dir()
+
+    assert "PROMETHEUS_MULTIPROC_DIR" not in os.environ
+    assert not path.exists()
+
+
+def test_multiprocess_metrics_dir_is_cleared(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    (tmp_path / "gauge_livesum_123.db").write_bytes(b"stale")
+
+    with multiprocess_metrics_dir(workers=2):
+        assert not list(tmp_path.iterdir())
+        (tmp_path / "counter_456.db").write_bytes(b"")
+
+    assert tmp_path.is_dir()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.utils.admission import AdmissionController, Overloaded
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_slot_is_handed_to_waiter() -> None:
+    controller = AdmissionController(limit=1, max_queue=1, target=0.01, interval=1.0)
+    await controller.acquire()
+
+    waiter = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+    assert controller.queued == 1
+
+    controller.release()
+    assert await waiter >= 0.0
+    assert controller.active == 1
+    assert controller.queued == 0
+
+    controller.release()
+    assert controller.active == 0
+
+
+async def test_slot_handed_over_as_wait_times_out_is_kept(monkeypatch: pytest.MonkeyPatch) -> None:
+    controller = AdmissionController(limit=1, max_queue=1, target=0.01, interval=1.0)
+    await controller.acquire()
+
+    async def release_then_time_out(waiter: asyncio.Future, timeout: float) -> None:
+        # release() hands the slot over in the same loop iteration as the queue deadline
+        controller.release()
+        raise TimeoutError
+
+    monkeypatch.setattr(asyncio, "wait_for", release_then_time_out)
+    assert await controller.acquire() >= 0.0
+    assert controller.active == 1
+
+    controller.release()
+    assert controller.active == 0
+    assert controller.queued == 0
+
+
+async def test_full_queue_is_rejected() -> None:
+    controller = AdmissionController(limit=1, max_queue=0, target=0.01, interval=1.0)
+    await controller.acquire()
+
+    with pytest.raises(Overloaded) as overloaded:
+        await controller.acquire()
+    assert overloaded.value.reason == "queue_full"
+
+
+async def test_standing_queue_sheds_after_target() -> None:
+    controller = AdmissionController(limit=1, max_queue=10, target=0.01, interval=0.05)
+    await controller.acquire()
+
+    # waiters may queue for the whole interval while arrivals keep the queue from draining
+    waiters = [asyncio.create_task(controller.acquire())]
+    await asyncio.sleep(0.03)
+    waiters.append(asyncio.create_task(controller.acquire()))
+    await asyncio.sleep(0.03)
+    assert controller.overloaded
+
+    started_at = asyncio.get_running_loop().time()
+    with pytest.raises(Overloaded) as overloaded:
+        await controller.acquire()
+    assert overloaded.value.reason == "queue_timeout"
+    assert asyncio.get_running_loop().time() - started_at < 0.04
+
+    for waiter in waiters:
+        with pytest.raises(Overloaded):
+            await waiter
+    assert controller.queued == 0
+    assert not controller.overloaded
@@ -0,0 +1,67 @@
+import io
+import json
+import logging
+import threading
+
+from app.utils.custom_logging import BatchedLogWriter, JsonLogSink, SampledAccessLogFilter
+
+
+class BlockingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.writing.set()
+        self.release.wait(timeout=5)
+        return super().write(text)
+
+
+def test_batched_log_writer_drops_when_full() -> None:
+    stream = BlockingStream()
+    writer = BatchedLogWriter(stream, queue_size=1, batch_size=10)
+
+    writer.write("first\n")
+    stream.writing.wait(timeout=5)
+    writer.write("second\n")
+    writer.write("third\n")
+
+    assert writer.stats() == {"queue_depth": 1, "dropped": 1, "written": 0}
+
+    stream.release.set()
+    writer.close()
+
+    assert stream.getvalue() == "first\nsecond\n"
+    assert writer.stats() == {"queue_depth": 0, "dropped": 1, "written": 2}
+
+
+def test_json_log_sink() -> None:
+    from loguru import logger
+
+    stream = io.StringIO()
+    writer = BatchedLogWriter(stream, queue_size=100, batch_size=10)
+    handler_id = logger.add(JsonLogSink(writer, caller_info=False), format="{message}", level="INFO")
+    try:
+        logger.debug("gated")
+        logger.info("hello {}", "world")
+    finally:
+        logger.remove(handler_id)
+        writer.close()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["message"] == "hello world"
+    assert lines[0]["level"] == "INFO"
+    assert "function" not in lines[0]
+
+
+def test_sampled_access_log_filter() -> None:
+    log_filter = SampledAccessLogFilter(sample_rate=0.0)
+
+    def access_record(status_code: int) -> logging.LogRecord:
+        args = ("127.0.0.1:1234", "GET", "/api/v1/users", "1.1", status_code)
+        return logging.LogRecord("uvicorn.access", logging.INFO, __file__, 1, '%s - "%s %s HTTP/%s" %d', args, None)
+
+    assert not log_filter.filter(access_record(200))
+    assert log_filter.filter(access_record(503))
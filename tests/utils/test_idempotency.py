@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from fakeredis import aioredis
+
+from app.utils.idempotency import MemoryIdempotencyBackend, RedisIdempotencyBackend, StoredResponse
+
+pytestmark = pytest.mark.asyncio
+
+RESPONSE = StoredResponse(status=201, headers=[(b"content-type", b"application/json")], body=b"{}")
+
+
+async def test_failed_execution_frees_the_key() -> None:
+    store = MemoryIdempotencyBackend(ttl=60.0)
+    record, _ = await store.claim("key", "fingerprint")
+    await store.complete("key", record, None)
+
+    assert record.done.is_set()
+    assert store.get("key") is None
+
+
+async def test_eviction_counts_in_flight_records() -> None:
+    store = MemoryIdempotencyBackend(ttl=60.0, max_keys=2)
+    await store.claim("first", "a")
+    second, _ = await store.claim("second", "b")
+    await store.claim("third", "c")
+
+    assert len(store) == 2
+    assert store.get("first") is None
+    assert store.get("second") is second
+
+
+async def test_eviction_follows_expiry_order() -> None:
+    store = MemoryIdempotencyBackend(ttl=60.0, max_keys=2)
+    done, _ = await store.claim("done", "a")
+    await store.claim("running", "b")
+    # completing restarts the ttl, so the record that is still running now expires first
+    await store.complete("done", done, RESPONSE)
+    await store.claim("new", "c")
+
+    assert len(store) == 2
+    assert store.get("done") is done
+    assert store.get("running") is None
+
+
+async def test_expired_records_are_evicted_first() -> None:
+    store = MemoryIdempotencyBackend(ttl=0.0, max_keys=2)
+    old, _ = await store.claim("old", "a")
+    await store.complete("old", old, RESPONSE)
+    store.ttl = 60.0
+    live, _ = await store.claim("live", "b")
+    await store.claim("new", "c")
+
+    assert len(store) == 2
+    assert store.get("live") is live
+
+
+async def test_redis_backend_is_shared_between_workers() -> None:
+    client = aioredis.FakeRedis()
+    first = RedisIdempotencyBackend(client, ttl=60.0, pending_ttl=5.0, poll_interval=0.01)
+    second = RedisIdempotencyBackend(client, ttl=60.0, pending_ttl=5.0, poll_interval=0.01)
+
+    record, claimed = await first.claim("key", "fingerprint")
+    assert claimed
+    pending, claimed = await second.claim("key", "fingerprint")
+    assert not claimed
+    assert pending.response is None
+
+    waiting = asyncio.create_task(second.wait("key", pending))
+    await first.complete("key", record, RESPONSE)
+    await asyncio.wait_for(waiting, 1.0)
+
+    replayed, claimed = await second.claim("key", "fingerprint")
+    assert not claimed
+    assert replayed.response == RESPONSE
+    assert 59_000 < await client.pttl("idempotency:key") <= 60_000
+
+
+async def test_redis_backend_frees_the_key_of_a_failed_execution() -> None:
+    client = aioredis.FakeRedis()
+    store = RedisIdempotencyBackend(client, ttl=60.0, pending_ttl=5.0)
+
+    record, _ = await store.claim("key", "fingerprint")
+    assert 4_000 < await client.pttl("idempotency:key") <= 5_000
+    await store.complete("key", record, None)
+
+    assert (await store.claim("key", "other"))[1]
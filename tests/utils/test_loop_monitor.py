@@ -0,0 +1,26 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.loop_monitor import EventLoopMonitor
+
+pytestmark = pytest.mark.asyncio
+
+
+def _blocking_call() -> None:
+    time.sleep(0.3)
+
+
+async def test_event_loop_monitor_reports_blocking_call() -> None:
+    monitor = EventLoopMonitor(interval=0.01, block_threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        _blocking_call()
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+
+    assert monitor.stalls == 1
+    assert "_blocking_call" in monitor.last_stack
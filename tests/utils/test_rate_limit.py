@@ -0,0 +1,83 @@
+import pytest
+from fakeredis import aioredis
+
+from app.utils.rate_limit import MemoryRateLimitBackend, RedisRateLimitBackend, gcra_step
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_memory_backend_allows_burst_then_limits() -> None:
+    backend = MemoryRateLimitBackend(clock=FakeClock())
+    results = [await backend.hit("key", limit=3, window=60) for _ in range(4)]
+
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results] == [2, 1, 0, 0]
+    assert results[-1].retry_after == 20
+    assert results[-1].headers()["Retry-After"] == "20"
+    assert (await backend.hit("other", limit=3, window=60)).allowed
+
+
+async def test_memory_backend_refills_with_the_clock() -> None:
+    clock = FakeClock()
+    backend = MemoryRateLimitBackend(clock=clock)
+    for _ in range(3):
+        await backend.hit("key", limit=3, window=60)
+
+    clock.now += 20
+    refilled = await backend.hit("key", limit=3, window=60)
+
+    assert refilled.allowed
+    assert refilled.remaining == 0
+    assert refilled.headers()["RateLimit-Reset"] == "60"
+
+
+async def test_memory_backend_evicts_refilled_then_least_recent_keys() -> None:
+    clock = FakeClock()
+    backend = MemoryRateLimitBackend(max_keys=3, clock=clock)
+    await backend.hit("refilled", limit=1, window=1)
+    clock.now += 2
+    for key in ("oldest", "recent"):
+        await backend.hit(key, limit=1, window=60)
+
+    # the refilled bucket goes first, so a third live key still fits
+    await backend.hit("third", limit=1, window=60)
+    assert list(backend._tats) == ["oldest", "recent", "third"]
+
+    # hitting ``oldest`` again makes ``recent`` the least recently hit live key
+    assert not (await backend.hit("oldest", limit=1, window=60)).allowed
+    await backend.hit("fourth", limit=1, window=60)
+    assert list(backend._tats) == ["third", "oldest", "fourth"]
+
+
+async def test_gcra_refills_over_time() -> None:
+    tat = None
+    for _ in range(2):
+        allowed, tat, _, _ = gcra_step(tat, now=0.0, limit=2, window=10)
+        assert allowed
+
+    assert not gcra_step(tat, now=0.0, limit=2, window=10)[0]
+    assert gcra_step(tat, now=5.0, limit=2, window=10)[0]
+
+
+async def test_redis_backend_runs_the_script() -> None:
+    # fakeredis evaluates the Lua script itself, with lupa, against its own clock
+    client = aioredis.FakeRedis()
+    first, second = RedisRateLimitBackend(client), RedisRateLimitBackend(client)
+
+    results = [await first.hit("key", limit=2, window=10), await second.hit("key", limit=2, window=10)]
+    denied = await first.hit("key", limit=2, window=10)
+
+    assert [result.allowed for result in results] == [True, True]
+    assert [result.remaining for result in results] == [1, 0]
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(5, abs=0.5)
+    assert denied.headers()["Retry-After"] == "5"
+    assert 9_000 < await client.pttl("ratelimit:key") <= 10_000
@@ -0,0 +1,67 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+from fastapi.responses import Response
+
+from app.utils.response_cache import ResponseCache
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_loader(delay: float = 0.0) -> tuple[list[int], Callable[[], Awaitable[Response]]]:
+    calls = []
+
+    async def load() -> Response:
+        calls.append(len(calls))
+        await asyncio.sleep(delay)
+        return Response(content=f"page {len(calls)}", media_type="text/plain")
+
+    return calls, load
+
+
+async def test_concurrent_misses_share_one_load() -> None:
+    cache = ResponseCache("test", ttl=60.0, stale_ttl=0.0, max_entries=8, max_bytes=1024)
+    calls, load = make_loader(delay=0.01)
+
+    responses = await asyncio.gather(*(cache.get_or_load("page", load) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert {response.body for response in responses} == {b"page 1"}
+
+
+async def test_invalidate_bumps_generation() -> None:
+    cache = ResponseCache("test", ttl=60.0, stale_ttl=60.0, max_entries=8, max_bytes=1024)
+    calls, load = make_loader()
+
+    await cache.get_or_load("page", load)
+    assert (await cache.get_or_load("page", load)).body == b"page 1"
+
+    cache.invalidate()
+    assert (await cache.get_or_load("page", load)).body == b"page 2"
+    assert len(calls) == 2
+
+
+async def test_expired_entry_is_served_stale_during_refresh() -> None:
+    cache = ResponseCache("test", ttl=0.0, stale_ttl=60.0, max_entries=8, max_bytes=1024)
+    calls, load = make_loader(delay=0.01)
+    await cache.get_or_load("page", load)
+
+    refresh = asyncio.create_task(cache.get_or_load("page", load))
+    await asyncio.sleep(0)
+    stale = await cache.get_or_load("page", load)
+
+    assert stale.body == b"page 1"
+    assert (await refresh).body == b"page 2"
+    assert len(calls) == 2
+
+
+async def test_eviction_is_bounded_by_bytes() -> None:
+    cache = ResponseCache("test", ttl=60.0, stale_ttl=0.0, max_entries=8, max_bytes=12)
+    _, load = make_loader()
+
+    for key in range(3):
+        await cache.get_or_load(key, load)
+
+    assert len(cache) == 2
+    assert cache.size == 12
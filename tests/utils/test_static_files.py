@@ -0,0 +1,76 @@
+import gzip
+from os import environ
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED, HTTP_404_NOT_FOUND
+
+from app.utils.static_files import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, accepts_gzip
+
+environ["APP_ENV"] = "test"
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_docs_reference_hashed_assets(app: FastAPI, client: AsyncClient) -> None:
+    static_files = app.state.static_files
+    hashed_path = static_files.url_path("swagger-ui-bundle.js")
+
+    response = await client.get("/docs")
+
+    assert response.status_code == HTTP_200_OK
+    assert hashed_path != "swagger-ui-bundle.js"
+    assert f"/static/{hashed_path}" in response.text
+    assert f"/static/{static_files.url_path('swagger-ui.css')}" in response.text
+
+
+async def test_hashed_asset_is_immutable_and_compressed(app: FastAPI, client: AsyncClient) -> None:
+    hashed_path = app.state.static_files.url_path("swagger-ui.css")
+
+    response = await client.get(f"/static/{hashed_path}", headers={"Accept-Encoding": "gzip"})
+    etag = response.headers.get("etag")
+
+    assert response.status_code == HTTP_200_OK
+    assert response.headers.get("cache-control") == IMMUTABLE_CACHE_CONTROL
+    assert response.headers.get("content-encoding") == "gzip"
+    assert response.headers.get("vary") == "Accept-Encoding"
+    assert int(response.headers.get("content-length")) < len(response.content)
+
+    response = await client.get(f"/static/{hashed_path}", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    response = await client.get(f"/static/{hashed_path}", headers={"Accept-Encoding": "identity"})
+    assert response.headers.get("content-encoding") is None
+    assert response.headers.get("etag") != etag
+    assert gzip.decompress(app.state.static_files.assets[hashed_path][0].gzipped) == response.content
+
+
+async def test_plain_asset_is_revalidated(client: AsyncClient) -> None:
+    response = await client.get("/static/public/test/test2.html")
+
+    assert response.status_code == HTTP_200_OK
+    assert response.headers.get("cache-control") == REVALIDATE_CACHE_CONTROL
+    assert response.headers.get("content-encoding") is None
+    assert response.headers.get("etag") is not None
+
+    response = await client.get("/static/missing.js")
+    assert response.status_code == HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("gzip;q=0", False),
+        ("*", True),
+        ("identity", False),
+        ("", False),
+        ("*;q=0, gzip", True),
+        ("gzip;q=0, *", False),
+        ("gzip;q=x", False),
+    ],
+)
+async def test_accepts_gzip(accept_encoding: str, expected: bool) -> None:
+    assert accepts_gzip(accept_encoding) is expected